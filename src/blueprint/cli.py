@@ -7,6 +7,7 @@ import asyncio
 import click
 
 from . import __version__
+from .orchestrator.loop import configure_event_loop
 
 
 @click.group(invoke_without_command=True)
@@ -15,6 +16,7 @@ from . import __version__
 @click.pass_context
 def main(ctx: click.Context, feature: str) -> None:
     """Blueprint - Multi-LLM Development Orchestrator."""
+    configure_event_loop()
     if ctx.invoked_subcommand is None:
         # Default to console chat mode
         try:
@@ -6,6 +6,7 @@ import json
 import os
 import platform
 import stat
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -15,6 +16,18 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for Python <3.11
     import tomli as tomllib  # type: ignore
 
 
+@lru_cache(maxsize=8)
+def _read_personas_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a personas.toml once per modification (``mtime_ns`` is the cache key)."""
+    with open(path, "rb") as f:
+        return tomllib.load(f).get("personas", {})
+
+
+def _load_personas_file(personas_file: Path) -> Dict[str, Any]:
+    """Return a fresh top-level copy of the cached personas table."""
+    return dict(_read_personas_file(str(personas_file), personas_file.stat().st_mtime_ns))
+
+
 class ConfigLoader:
     """
     Handles configuration loading from multiple sources with priority resolution.
@@ -88,18 +101,23 @@ class ConfigLoader:
         """Load credentials with security checks."""
         creds_file = self.global_dir / "credentials.toml"
 
-        if not creds_file.exists():
+        # One stat serves the existence, permission and empty-file checks.
+        try:
+            st = creds_file.stat()
+        except FileNotFoundError:
             self._create_default_credentials()
             return
 
         if platform.system() != "Windows":
-            st = creds_file.stat()
             # world/group readable bits disallowed
             if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
                 raise PermissionError(
                     f"Insecure permissions on {creds_file}. Run: chmod 600 {creds_file}"
                 )
 
+        if st.st_size == 0:
+            return
+
         with open(creds_file, "rb") as f:
             self.credentials = tomllib.load(f)
 
@@ -107,10 +125,10 @@ class ConfigLoader:
         """Load global personas."""
         personas_file = self.global_dir / "personas.toml"
         if personas_file.exists():
-            with open(personas_file, "rb") as f:
-                self.personas = tomllib.load(f).get("personas", {})
+            self.personas = _load_personas_file(personas_file)
         else:
-            self.personas = self._get_default_personas()
+            # Same flat name -> table shape as a parsed personas.toml.
+            self.personas = self._get_default_personas()["personas"]
             self._create_default_personas()
 
     def _load_project_config(self) -> None:
@@ -125,9 +143,7 @@ class ConfigLoader:
         """Load project-specific personas."""
         personas_file = self.project_dir / "personas.toml"
         if personas_file.exists():
-            with open(personas_file, "rb") as f:
-                project_personas = tomllib.load(f).get("personas", {})
-                self.personas.update(project_personas)
+            self.personas.update(_load_personas_file(personas_file))
 
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides (BLUEPRINT_*)."""
@@ -258,6 +274,8 @@ class ConfigLoader:
                 "permission_mode": "manual",
                 "sandbox_enabled": True,
                 "timeout_seconds": 300,
+                "max_workers": 8,
+                "parallel": True,
                 "auto_approve": [
                     "read_file:src/**",
                     "list_directory:**",
@@ -275,6 +293,7 @@ class ConfigLoader:
                 "enabled": True,
                 "ttl_seconds": 3600,
                 "max_entries": 1000,
+                "normalize_keys": False,
             },
         }
 
@@ -294,6 +313,8 @@ class ConfigLoader:
                 "fallback_chain = [\"claude\", \"openai\", \"gemini\", \"ollama\"]",
                 "auto_switch_on_context_limit = true",
                 "streaming_preferred = true",
+                "# Seconds before also trying the next fallback provider (unset: strictly sequential)",
+                "# fallback_hedge_delay = 2.0",
                 "",
                 "[backends.claude]",
                 'provider = "claude"',
@@ -347,6 +368,8 @@ class ConfigLoader:
                 'permission_mode = "manual"',
                 "sandbox_enabled = true",
                 "timeout_seconds = 300",
+                "max_workers = 8",
+                "parallel = true",
                 'auto_approve = ["read_file:src/**", "list_directory:**", "search_code:**"]',
                 "",
                 "[quotas]",
@@ -360,6 +383,7 @@ class ConfigLoader:
                 "enabled = true",
                 "ttl_seconds = 3600",
                 "max_entries = 1000",
+                "normalize_keys = false",
                 "",
             ]
         )
@@ -23,6 +23,7 @@ from .orchestrator.orchestrator import LLMOrchestrator
 from .orchestrator.supervisor import Supervisor
 from .state.feature import Feature
 from .state.tasks import Task, TaskManager, TaskStatus, TaskType
+from .utils.executables import resolve_executable
 
 
 STATUS_SYMBOLS = {
@@ -624,6 +625,7 @@ class ConsoleChat:
             deepseek = getattr(self.router, "deepseek", None)
             if deepseek:
                 await deepseek.stop_daemon()
+            await self.router.aclose()
         except Exception:
             # Best-effort cleanup; ignore errors on exit.
             pass
@@ -740,7 +742,11 @@ class ConsoleChat:
         pattern = parts[0]
         target = Path(parts[1]).expanduser() if len(parts) > 1 else Path(".")
 
-        rg_cmd = ["rg", "--no-heading", "--line-number", "--color", "never", pattern, str(target)]
+        rg = resolve_executable("rg")
+        if rg is None:
+            click.echo(self._color("ripgrep (rg) not found. Please install rg.", "warning"))
+            return
+        rg_cmd = [rg, "--no-heading", "--line-number", "--color", "never", pattern, str(target)]
         try:
             proc = await asyncio.create_subprocess_exec(
                 *rg_cmd,
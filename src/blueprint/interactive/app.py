@@ -25,6 +25,7 @@ from ..models.router import ModelRole, ModelRouter
 from ..orchestrator.executor import TaskExecutor
 from ..state.feature import Feature
 from ..state.tasks import TaskManager, TaskType
+from ..utils.executables import resolve_executable
 from ..utils.usage_tracker import UsageTracker
 
 
@@ -513,9 +514,12 @@ Repository and task context:
 
     async def _list_ollama_models(self) -> list[str]:
         """List available ollama models."""
+        ollama = resolve_executable("ollama")
+        if ollama is None:
+            return []
         try:
             process = await asyncio.create_subprocess_exec(
-                "ollama",
+                ollama,
                 "list",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 from typing import Callable, Dict
 
 from ..orchestrator.executor import TaskExecutor
 from ..state.feature import Feature
 from ..state.tasks import TaskManager
+from ..utils.executables import resolve_executable
 from ..utils.usage_tracker import UsageTracker
 
 
@@ -221,12 +223,17 @@ Other:
         config = Config()
         model = config.get("local_model", "deepseek-coder:14b")
 
+        ollama = resolve_executable("ollama")
+        if ollama is None:
+            self.app.output_panel.write_error("Ollama not found. Please install ollama first.")
+            return
+
         self.app.output_panel.write_line(f"[dim]Using model: {model}[/dim]")
         self.app.output_panel.write_line("")
 
         try:
             process = await asyncio.create_subprocess_exec(
-                "ollama",
+                ollama,
                 "run",
                 model,
                 prompt,
@@ -234,12 +241,23 @@ Other:
                 stderr=asyncio.subprocess.PIPE,
             )
 
-            # Stream output line by line
+            # Stream output in chunks; the incremental decoder keeps multi-byte characters
+            # split across reads intact, and only the unfinished last line stays buffered.
             if process.stdout:
-                async for line_bytes in process.stdout:
-                    line = line_bytes.decode(errors="replace").rstrip()
-                    if line:
-                        self.app.output_panel.write_line(line)
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                pending = ""
+                while True:
+                    chunk = await process.stdout.read(65536)
+                    pending += decoder.decode(chunk, final=not chunk)
+                    *lines, pending = pending.split("\n")
+                    for line in lines:
+                        line = line.rstrip()
+                        if line:
+                            self.app.output_panel.write_line(line)
+                    if not chunk:
+                        break
+                if pending.rstrip():
+                    self.app.output_panel.write_line(pending.rstrip())
 
             await process.wait()
 
@@ -9,6 +9,7 @@ from .base import (
     LLMException,
     LLMUnavailableException,
     ModelInfo,
+    PARTIAL_ARGUMENTS,
     Provider,
     ProviderHealth,
     StreamChunk,
@@ -35,6 +36,7 @@ __all__ = [
     "LLMUnavailableException",
     "LLMExecutionException",
     "ModelInfo",
+    "PARTIAL_ARGUMENTS",
     "Provider",
     "ProviderHealth",
     "StreamChunk",
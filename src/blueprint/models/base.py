@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import abc
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import Any, AsyncGenerator, Dict, List, Mapping, MutableMapping, Optional, Sequence
 
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters fall back to a regular __dict__.
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class LLMException(Exception):
     """Base exception for LLM failures."""
 
@@ -39,6 +45,10 @@ class ChatMessage:
     tool_call_id: Optional[str] = None
 
 
+# Stands in for ToolCall.arguments while a streamed call's arguments are still arriving.
+PARTIAL_ARGUMENTS: Mapping[str, Any] = MappingProxyType({})
+
+
 @dataclass
 class ToolCall:
     """Tool invocation emitted by a model."""
@@ -47,6 +57,11 @@ class ToolCall:
     name: str
     arguments: Mapping[str, Any]
 
+    @property
+    def is_partial(self) -> bool:
+        """True for streaming progress notices whose arguments are not complete yet."""
+        return self.arguments is PARTIAL_ARGUMENTS
+
 
 @dataclass
 class Usage:
@@ -56,6 +71,8 @@ class Usage:
     completion_tokens: int = 0
     total_tokens: int = 0
     estimated_cost: Optional[float] = None
+    # Prompt tokens served from the provider's prompt cache (subset of prompt_tokens).
+    cached_tokens: int = 0
 
 
 @dataclass
@@ -71,6 +88,29 @@ class ChatRequest:
     stop: Optional[Sequence[str]] = None
     tools: Optional[Sequence[Mapping[str, Any]]] = None
     metadata: MutableMapping[str, Any] = field(default_factory=dict)
+    # Provider-agnostic {"role", "content"} dicts built once and shared across fallback attempts.
+    prebuilt_messages: Optional[List[Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+
+    def message_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Role/content dicts for ``messages``.
+
+        ``prebuilt_messages`` is returned only while every entry still holds the very role and
+        content objects of its message, so reassigned lists and edited messages are rebuilt.
+        """
+        prebuilt = self.prebuilt_messages
+        if (
+            prebuilt is not None
+            and len(prebuilt) == len(self.messages)
+            and all(d["role"] is m.role and d["content"] is m.content for d, m in zip(prebuilt, self.messages))
+        ):
+            return prebuilt
+        return build_message_dicts(self.messages)
+
+
+def build_message_dicts(messages: Sequence[ChatMessage]) -> List[Dict[str, Any]]:
+    """Return the plain role/content representation shared by most chat APIs."""
+    return [{"role": m.role, "content": m.content} for m in messages]
 
 
 @dataclass
@@ -86,7 +126,7 @@ class ChatResponse:
     metadata: MutableMapping[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StreamChunk:
     """Chunk of streamed output."""
 
@@ -158,3 +198,7 @@ class BaseAdapter(abc.ABC):
     async def get_context_limit(self) -> Optional[int]:
         """Return an optional context window if discoverable."""
         return None
+
+    async def aclose(self) -> None:
+        """Release pooled network resources held by the adapter."""
+        return None
@@ -3,8 +3,34 @@
 from __future__ import annotations
 
 import hashlib
+import re
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Final, Optional, Tuple
+
+_TRAILING_WS = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+# Responses are replayed only for (near-)deterministic sampling; shared by every cache layer.
+CACHE_MAX_TEMPERATURE: Final[float] = 0.1
+
+
+def is_cacheable_temperature(temperature: Optional[float]) -> bool:
+    """
+    Whether a response sampled at ``temperature`` may be served from cache.
+
+    An unset temperature means the provider default (1.0 for OpenAI), which samples.
+    """
+    return temperature is not None and temperature <= CACHE_MAX_TEMPERATURE
+
+
+def normalize_prompt_text(text: str) -> str:
+    """
+    Canonicalize insignificant whitespace so near-identical prompts share a cache key.
+
+    Leading indentation is preserved because it is meaningful in code under review.
+    """
+    text = _TRAILING_WS.sub("", text.replace("\r\n", "\n"))
+    return _BLANK_RUNS.sub("\n\n", text).strip()
 
 
 class CacheManager:
@@ -14,23 +40,37 @@ class CacheManager:
         self.ttl_seconds = ttl_seconds
         self.max_entries = max_entries
         self._store: Dict[str, Tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
 
     def get_cache_key(self, payload: Dict[str, Any]) -> str:
         """Hash a request payload to derive a cache key."""
         data = repr(payload).encode("utf-8")
-        return hashlib.sha256(data).hexdigest()
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+    def get_bytes_key(self, data: bytes) -> str:
+        """Hash an already-serialized request body to derive a cache key."""
+        # BLAKE2b: faster than SHA-256 on multi-KB prompts and in the stdlib.
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve a cached entry if valid."""
         entry = self._store.get(key)
         if not entry:
+            self.misses += 1
             return None
         ts, value = entry
         if (time.time() - ts) > self.ttl_seconds:
             self._store.pop(key, None)
+            self.misses += 1
             return None
+        self.hits += 1
         return value
 
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._store)}
+
     def set(self, key: str, value: Any) -> None:
         """Store a cache entry, evicting oldest if at capacity."""
         if len(self._store) >= self.max_entries:
@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator, Dict, List, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -22,9 +21,28 @@ from .base import (
     Usage,
 )
 from .credentials import CredentialsManager
+from .http import PooledClientMixin
+from .ratelimit import RequestLimiter
+from .sse import iter_sse_data
+from ..utils import fastjson
 
 
-class ClaudeAdapter(BaseAdapter):
+async def _read_body(resp: httpx.Response) -> bytearray:
+    """Read a response body into a buffer preallocated from Content-Length when known."""
+    # Content-Length describes the encoded payload; only trust it for identity bodies.
+    size = 0 if resp.headers.get("content-encoding") else int(resp.headers.get("content-length") or 0)
+    buf = bytearray(size)
+    pos = 0
+    async for chunk in resp.aiter_bytes():
+        end = pos + len(chunk)
+        # Same-length slice writes stay in place; overruns grow the buffer.
+        buf[pos:end] = chunk
+        pos = end
+    del buf[pos:]
+    return buf
+
+
+class ClaudeAdapter(PooledClientMixin, BaseAdapter):
     """Adapter for Claude Messages API."""
 
     provider = Provider.CLAUDE
@@ -36,6 +54,7 @@ class ClaudeAdapter(BaseAdapter):
         base_url: str | None = None,
         api_version: str = "2023-06-01",
         timeout: float = 30.0,
+        max_concurrency: int = 8,
     ) -> None:
         self.credentials = credentials or CredentialsManager()
         self.default_model = default_model
@@ -44,6 +63,8 @@ class ClaudeAdapter(BaseAdapter):
         )
         self.api_version = api_version
         self.timeout = timeout
+        self.limiter = RequestLimiter(max_concurrency)
+        self._cached_headers: Optional[Tuple[str, Dict[str, str]]] = None
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         api_key = self.credentials.get_api_key(Provider.CLAUDE)
@@ -53,14 +74,15 @@ class ClaudeAdapter(BaseAdapter):
         payload = self._build_payload(request, stream=False)
         url = f"{self.base_url}/v1/messages"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.post(url, headers=self._headers(api_key), json=payload)
+        client = await self._get_client()
+        try:
+            async with self.limiter, client.stream("POST", url, headers=self._headers(api_key), json=payload) as resp:
                 resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Claude request failed: {exc}") from exc
+                body = await _read_body(resp)
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Claude request failed: {exc}") from exc
 
-        data = resp.json()
+        data = fastjson.loads(body)
         content_text = self._extract_text_blocks(data.get("content") or [])
         usage = self._parse_usage(data.get("usage"))
         tool_calls = self._parse_tool_calls(data.get("content") or [])
@@ -83,72 +105,73 @@ class ClaudeAdapter(BaseAdapter):
         payload = self._build_payload(request, stream=True)
         url = f"{self.base_url}/v1/messages"
 
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("POST", url, headers=self._headers(api_key), json=payload) as resp:
-                    resp.raise_for_status()
-                    async for raw_line in resp.aiter_lines():
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        if line.startswith("data:"):
-                            line = line[len("data:") :].strip()
-                        if line == "[DONE]":
-                            yield StreamChunk(delta="", is_done=True, provider=self.provider, model=payload["model"])
-                            break
-
-                        try:
-                            data = json.loads(line)
-                        except json.JSONDecodeError as exc:
+        client = await self._get_client()
+        try:
+            async with self.limiter, client.stream(
+                "POST",
+                url,
+                headers=self._headers(api_key),
+                json=payload,
+                timeout=httpx.Timeout(None, connect=self.timeout),
+            ) as resp:
+                resp.raise_for_status()
+                async for line in iter_sse_data(resp):
+                    if line == b"[DONE]":
+                        yield StreamChunk(delta="", is_done=True, provider=self.provider, model=payload["model"])
+                        break
+
+                    try:
+                        data = fastjson.loads(line)
+                    except fastjson.JSONDecodeError as exc:
+                        yield StreamChunk(
+                            delta="",
+                            is_done=False,
+                            provider=self.provider,
+                            model=payload["model"],
+                            error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
+                        )
+                        continue
+
+                    chunk_type = data.get("type")
+                    delta_text = ""
+                    tool_call = None
+                    if chunk_type == "content_block_delta":
+                        delta_text = (data.get("delta") or {}).get("text", "") or ""
+                    elif chunk_type == "message_delta":
+                        if data.get("delta", {}).get("stop_reason"):
                             yield StreamChunk(
                                 delta="",
-                                is_done=False,
+                                is_done=True,
                                 provider=self.provider,
-                                model=payload["model"],
-                                error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
+                                model=data.get("model") or payload["model"],
+                                usage=self._parse_usage(data.get("usage")),
                             )
                             continue
+                    elif chunk_type == "content_block_start":
+                        block = data.get("content_block") or {}
+                        if block.get("type") == "tool_use":
+                            tool_call = ToolCall(
+                                id=str(block.get("id") or ""),
+                                name=block.get("name") or "",
+                                arguments=block.get("input") or {},
+                            )
 
-                        chunk_type = data.get("type")
-                        delta_text = ""
-                        tool_call = None
-                        if chunk_type == "content_block_delta":
-                            delta_text = (data.get("delta") or {}).get("text", "") or ""
-                        elif chunk_type == "message_delta":
-                            if data.get("delta", {}).get("stop_reason"):
-                                yield StreamChunk(
-                                    delta="",
-                                    is_done=True,
-                                    provider=self.provider,
-                                    model=data.get("model") or payload["model"],
-                                    usage=self._parse_usage(data.get("usage")),
-                                )
-                                continue
-                        elif chunk_type == "content_block_start":
-                            block = data.get("content_block") or {}
-                            if block.get("type") == "tool_use":
-                                tool_call = ToolCall(
-                                    id=str(block.get("id") or ""),
-                                    name=block.get("name") or "",
-                                    arguments=block.get("input") or {},
-                                )
-
-                        yield StreamChunk(
-                            delta=delta_text,
-                            is_done=False,
-                            provider=self.provider,
-                            model=data.get("model") or payload["model"],
-                            usage=None,
-                            tool_call=tool_call,
-                        )
-            except httpx.HTTPError as exc:
-                yield StreamChunk(
-                    delta="",
-                    is_done=True,
-                    provider=self.provider,
-                    model=request.model or self.default_model,
-                    error=LLMExecutionException(f"Claude stream failed: {exc}"),
-                )
+                    yield StreamChunk(
+                        delta=delta_text,
+                        is_done=False,
+                        provider=self.provider,
+                        model=data.get("model") or payload["model"],
+                        usage=None,
+                        tool_call=tool_call,
+                    )
+        except httpx.HTTPError as exc:
+            yield StreamChunk(
+                delta="",
+                is_done=True,
+                provider=self.provider,
+                model=request.model or self.default_model,
+                error=LLMExecutionException(f"Claude stream failed: {exc}"),
+            )
 
     async def list_models(self) -> List[ModelInfo]:
         api_key = self.credentials.get_api_key(Provider.CLAUDE)
@@ -156,14 +179,14 @@ class ClaudeAdapter(BaseAdapter):
             raise LLMUnavailableException("ANTHROPIC_API_KEY not configured.")
 
         url = f"{self.base_url}/v1/models"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url, headers=self._headers(api_key))
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Failed to list Claude models: {exc}") from exc
+        client = await self._get_client()
+        try:
+            resp = await client.get(url, headers=self._headers(api_key))
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Failed to list Claude models: {exc}") from exc
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         results = []
         for model in data.get("data", []):
             model_id = model.get("id")
@@ -172,21 +195,27 @@ class ClaudeAdapter(BaseAdapter):
         return results
 
     async def check_health(self) -> ProviderHealth:
-        try:
-            await self.list_models()
-            return ProviderHealth(provider=self.provider, status="healthy")
-        except LLMException:
+        api_key = self.credentials.get_api_key(Provider.CLAUDE)
+        if not api_key:
             return ProviderHealth(provider=self.provider, status="down")
+        healthy = await self._probe_ok(f"{self.base_url}/v1/models?limit=1", headers=self._headers(api_key))
+        return ProviderHealth(provider=self.provider, status="healthy" if healthy else "down")
 
     def _headers(self, api_key: str) -> Dict[str, str]:
-        return {
-            "x-api-key": api_key,
-            "anthropic-version": self.api_version,
-            "Content-Type": "application/json",
-        }
+        # Rebuilt only when the key changes; httpx copies the mapping, so sharing it is safe.
+        if self._cached_headers is None or self._cached_headers[0] != api_key:
+            self._cached_headers = (
+                api_key,
+                {
+                    "x-api-key": api_key,
+                    "anthropic-version": self.api_version,
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._cached_headers[1]
 
     def _build_payload(self, request: ChatRequest, stream: bool) -> Dict[str, object]:
-        messages = [{"role": m.role, "content": m.content} for m in request.messages]
+        messages = request.message_dicts()
         payload: Dict[str, object] = {
             "model": request.model or self.default_model,
             "messages": messages,
@@ -238,6 +267,7 @@ class ClaudeAdapter(BaseAdapter):
             prompt_tokens=input_tokens,
             completion_tokens=output_tokens,
             total_tokens=input_tokens + output_tokens,
+            cached_tokens=int(payload.get("cache_read_input_tokens") or 0),
         )
 
     # --- Compatibility helpers for existing pipeline flows ---
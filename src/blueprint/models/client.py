@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import replace
 from typing import AsyncGenerator, Dict, Iterable, List, MutableMapping, Optional, Sequence
 
 from .base import (
@@ -15,8 +16,9 @@ from .base import (
     Provider,
     StreamChunk,
     ToolCall,
+    build_message_dicts,
 )
-from .cache import CacheManager
+from .cache import CacheManager, is_cacheable_temperature
 from ..config import ConfigLoader
 from .codex import OpenAIAdapter
 from .claude import ClaudeAdapter
@@ -31,8 +33,15 @@ from ..utils.usage_tracker import UsageTracker
 class AdapterFactory:
     """Creates provider adapters with shared credential/config objects."""
 
-    def __init__(self, credentials: Optional[CredentialsManager] = None) -> None:
+    def __init__(
+        self,
+        credentials: Optional[CredentialsManager] = None,
+        cache_enabled: bool = True,
+        normalize_cache_keys: bool = False,
+    ) -> None:
         self.credentials = credentials or CredentialsManager()
+        self.cache_enabled = cache_enabled
+        self.normalize_cache_keys = normalize_cache_keys
         self._cache: Dict[Provider, BaseAdapter] = {}
 
     def create(self, provider: Provider) -> BaseAdapter:
@@ -40,7 +49,11 @@ class AdapterFactory:
             return self._cache[provider]
         adapter: BaseAdapter
         if provider == Provider.OPENAI:
-            adapter = OpenAIAdapter(credentials=self.credentials)
+            adapter = OpenAIAdapter(
+                credentials=self.credentials,
+                cache_enabled=self.cache_enabled,
+                normalize_cache_keys=self.normalize_cache_keys,
+            )
         elif provider == Provider.CLAUDE:
             adapter = ClaudeAdapter(credentials=self.credentials)
         elif provider == Provider.GEMINI:
@@ -52,6 +65,11 @@ class AdapterFactory:
         self._cache[provider] = adapter
         return adapter
 
+    async def aclose(self) -> None:
+        """Close pooled connections held by created adapters."""
+        for adapter in self._cache.values():
+            await adapter.aclose()
+
 
 class LLMClient:
     """Facade over multiple LLM providers with fallback, caching, and usage tracking."""
@@ -65,9 +83,16 @@ class LLMClient:
     ) -> None:
         self.config = config or ConfigLoader()
         self.credentials = CredentialsManager(self.config)
-        self.adapter_factory = AdapterFactory(self.credentials)
+        self.cache_enabled = bool(self.config.get("cache.enabled", True))
+        self.adapter_factory = AdapterFactory(
+            self.credentials,
+            cache_enabled=self.cache_enabled,
+            normalize_cache_keys=bool(self.config.get("cache.normalize_keys", False)),
+        )
         self.stream_handler = StreamHandler()
         self.cache = CacheManager(ttl_seconds=cache_ttl_seconds, max_entries=cache_max_entries)
+        # Cache key -> result of the provider call already running for an identical deterministic request.
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.tool_engine = ToolEngine(config=self.config)
         self.tool_engine.set_auto_approve_patterns(self.config.get("tools.auto_approve", []) or [])
         self.usage_tracker = UsageTracker(feature_dir=None)
@@ -80,25 +105,60 @@ class LLMClient:
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         """Send a non-streaming request, respecting fallback chain and cache."""
-        cache_key = self.cache.get_cache_key(
-            {"messages": [m.__dict__ for m in request.messages], "model": request.model, "provider": str(request.metadata)}
-        )
+        if not (self.cache_enabled and is_cacheable_temperature(request.temperature)):
+            return await self._send(request, None)
+
+        # Only near-deterministic requests are worth replaying from cache, or sharing while in flight.
+        cache_key = self.cache.get_cache_key(self._cache_payload(request))
         cached = self.cache.get(cache_key)
         if cached:
             return cached
 
+        loop = asyncio.get_running_loop()
+        shared = self._inflight.get(cache_key)
+        if shared is not None and shared.get_loop() is loop:
+            try:
+                # Shielded so a cancelled follower leaves the shared call alone.
+                return await asyncio.shield(shared)
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+            # The caller making the call was cancelled; make it ourselves.
+            return await self.chat(request)
+
+        shared = self._inflight[cache_key] = loop.create_future()
+        try:
+            response = await self._send(request, cache_key)
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as exc:
+            shared.set_exception(exc)
+            # Followers re-raise it; avoid "exception was never retrieved" when there are none.
+            shared.exception()
+            raise
+        else:
+            shared.set_result(response)
+            return response
+        finally:
+            if self._inflight.get(cache_key) is shared:
+                del self._inflight[cache_key]
+
+    async def _send(self, request: ChatRequest, cache_key: Optional[str]) -> ChatResponse:
         providers = [request.provider] if request.provider else self.fallback_chain
+        if request.prebuilt_messages is None:
+            request = replace(request, prebuilt_messages=build_message_dicts(request.messages))
         last_error: Optional[Exception] = None
         for provider in providers:
             adapter = self.adapter_factory.create(provider)
             try:
                 response = await adapter.chat(request)
-                self._record_usage(response.provider.value, response.model, response.usage)
-                self.cache.set(cache_key, response)
-                return response
             except Exception as exc:  # noqa: PERF203
                 last_error = exc
                 continue
+            # Bookkeeping runs on the next loop tick so the caller gets the response first.
+            asyncio.get_running_loop().call_soon(self._post_response, cache_key, response)
+            return response
         raise LLMExecutionException(f"All providers failed. Last error: {last_error}")
 
     async def stream(self, request: ChatRequest) -> AsyncGenerator[StreamChunk, None]:
@@ -107,6 +167,9 @@ class LLMClient:
         adapters = [self.adapter_factory.create(p) for p in providers]
         if not adapters:
             raise LLMExecutionException("No providers configured for streaming.")
+        if request.prebuilt_messages is None:
+            # A copy, so retries and fallbacks share one build without touching the caller's request.
+            request = replace(request, prebuilt_messages=build_message_dicts(request.messages))
 
         async for chunk in self.stream_handler.handle_stream(
             request=request,
@@ -121,16 +184,17 @@ class LLMClient:
     async def list_models(self, provider: Optional[Provider] = None) -> List[Dict[str, str]]:
         """List available models across providers."""
         providers = [provider] if provider else self.fallback_chain
-        results: List[Dict[str, str]] = []
-        for p in providers:
+
+        async def _models_for(p: Provider) -> List[Dict[str, str]]:
             try:
-                adapter = self.adapter_factory.create(p)
-                models = await adapter.list_models()
-                for model in models:
-                    results.append({"id": model.id, "provider": model.provider.value})
+                models = await self.adapter_factory.create(p).list_models()
             except LLMException:
-                continue
-        return results
+                return []
+            return [{"id": model.id, "provider": model.provider.value} for model in models]
+
+        # Query providers concurrently; gather preserves fallback-chain ordering.
+        per_provider = await asyncio.gather(*(_models_for(p) for p in providers))
+        return [entry for entries in per_provider for entry in entries]
 
     async def planning_mode(self, context: MutableMapping[str, object]) -> ChatResponse:
         """Use a heavy model (default: Claude) to generate a structured plan."""
@@ -144,9 +208,13 @@ class LLMClient:
             model=context.get("model"),
         )
         response = await adapter.chat(request)
-        self._record_usage(response.provider.value, response.model, response.usage)
+        self._record_response_usage(response)
         return response
 
+    async def aclose(self) -> None:
+        """Release adapter network resources."""
+        await self.adapter_factory.aclose()
+
     def set_fallback_chain(self, chain: Sequence[Provider]) -> None:
         self.fallback_chain = list(chain)
 
@@ -155,11 +223,43 @@ class LLMClient:
 
     async def execute_tool(self, tool_call: ToolCall) -> MutableMapping[str, object]:
         try:
-            result = self.tool_engine.execute_tool(tool_call.name, tool_call.arguments)
+            # The engine blocks until the handler finishes; keep that off the event loop.
+            result = await asyncio.to_thread(self.tool_engine.execute_tool, tool_call.name, tool_call.arguments)
             return {"toolCallId": tool_call.id, "result": result, "approved": True}
         except Exception as exc:  # noqa: PERF203 - explicit propagation
             return {"toolCallId": tool_call.id, "result": None, "error": str(exc), "approved": False}
 
+    @staticmethod
+    def _cache_payload(request: ChatRequest) -> Dict[str, object]:
+        """Every request field that changes the answer; tools are sorted so their order does not split keys."""
+        tools = sorted(request.tools or (), key=lambda tool: repr(sorted(tool.items())))
+        return {
+            "messages": [m.__dict__ for m in request.messages],
+            "provider": request.provider.value if request.provider else None,
+            "model": request.model,
+            "tools": tools,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "top_p": request.top_p,
+            "stop": request.stop,
+            "metadata": request.metadata,
+        }
+
+    def _post_response(self, cache_key: Optional[str], response: ChatResponse) -> None:
+        """Cache a successful response and record its usage in one deferred step."""
+        if cache_key is not None:
+            try:
+                self.cache.set(cache_key, response)
+            except Exception:
+                # caching is best-effort
+                pass
+        self._record_response_usage(response)
+
+    def _record_response_usage(self, response: ChatResponse) -> None:
+        """Record a response's usage unless an adapter replayed it from its own cache."""
+        if not response.metadata.get("cached"):
+            self._record_usage(response.provider.value, response.model, response.usage)
+
     def _record_usage(self, provider: str, model: str, usage: Optional[MutableMapping[str, object]]) -> None:
         try:
             self.usage_tracker.record_usage(provider, model, usage)  # type: ignore[arg-type]
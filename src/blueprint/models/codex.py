@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator, Dict, List, Optional
+import asyncio
+from dataclasses import replace
+from typing import AsyncGenerator, Dict, Final, List, Optional, Tuple
 
 import httpx
 
@@ -15,16 +16,43 @@ from .base import (
     LLMExecutionException,
     LLMUnavailableException,
     ModelInfo,
+    PARTIAL_ARGUMENTS,
     Provider,
     ProviderHealth,
     StreamChunk,
     ToolCall,
     Usage,
 )
+from .cache import CacheManager, is_cacheable_temperature, normalize_prompt_text
 from .credentials import CredentialsManager
+from .http import PooledClientMixin
+from .ratelimit import RETRYABLE_STATUS, RequestLimiter, backoff_delay, parse_reset_duration
+from .sse import iter_sse_data
+from ..utils import fastjson
 
+_EMPTY: Final[Dict[str, object]] = {}
 
-class OpenAIAdapter(BaseAdapter):
+# Fixed instructions go in a leading system message so every call shares a byte-identical
+# prefix; OpenAI's prompt cache only reuses exact prefixes.
+REVIEW_TASKS_PROMPT: Final[str] = """Review the tasks provided by the user and suggest improvements.
+
+Return refined tasks JSON with clearer descriptions and dependencies."""
+
+REVIEW_CODE_PROMPT: Final[str] = """Review the user's code against the stated requirements.
+
+Respond in JSON format:
+{
+  "approved": true/false,
+  "feedback": "Detailed feedback",
+  "corrections": ["List of required corrections"]
+}"""
+
+CORRECTION_PROMPT: Final[str] = """Fix the issue described by the user in the provided code.
+
+Return only the corrected code."""
+
+
+class OpenAIAdapter(PooledClientMixin, BaseAdapter):
     """Adapter for OpenAI Chat Completions."""
 
     provider = Provider.OPENAI
@@ -35,6 +63,12 @@ class OpenAIAdapter(BaseAdapter):
         default_model: str = "gpt-4o",
         base_url: str | None = None,
         timeout: float = 30.0,
+        response_cache: CacheManager | None = None,
+        cache_enabled: bool = True,
+        normalize_cache_keys: bool = False,
+        max_concurrency: int = 8,
+        requests_per_minute: float | None = None,
+        max_retries: int = 3,
     ) -> None:
         self.credentials = credentials or CredentialsManager()
         self.default_model = default_model
@@ -42,6 +76,15 @@ class OpenAIAdapter(BaseAdapter):
             "/"
         )
         self.timeout = timeout
+        # Near-deterministic requests (see is_cacheable_temperature) are served from cache.
+        self.response_cache = response_cache or CacheManager()
+        self.cache_enabled = cache_enabled
+        # Opt-in: key on whitespace-normalized prompts so trivially reformatted inputs also hit.
+        self.normalize_cache_keys = normalize_cache_keys
+        # Shared across calls so bursts queue locally instead of tripping 429s.
+        self.limiter = RequestLimiter(max_concurrency=max_concurrency, requests_per_minute=requests_per_minute)
+        self.max_retries = max_retries
+        self._cached_headers: Optional[Tuple[str, Dict[str, str]]] = None
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         api_key = self.credentials.get_api_key(Provider.OPENAI)
@@ -50,22 +93,30 @@ class OpenAIAdapter(BaseAdapter):
 
         payload = self._build_payload(request, stream=False)
         url = f"{self.base_url}/chat/completions"
+        body = fastjson.dumps(payload)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(url, headers=self._headers(api_key), json=payload)
-                response.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"OpenAI request failed: {exc}") from exc
+        cache_key: str | None = None
+        if self.cache_enabled and is_cacheable_temperature(request.temperature):
+            key_body = self._cache_key_body(payload) if self.normalize_cache_keys else body
+            cache_key = self.response_cache.get_bytes_key(key_body)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                # Flagged so usage tracking does not count tokens this call never spent.
+                return replace(cached, metadata={**cached.metadata, "cached": True})
+
+        try:
+            response = await self._post_with_retries(url, api_key, body)
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"OpenAI request failed: {exc}") from exc
 
-        data = response.json()
+        data = fastjson.loads(response.content)
         choice = (data.get("choices") or [{}])[0]
         message = choice.get("message") or {}
         content = message.get("content", "")
         tool_calls = self._parse_tool_calls(message)
         usage = self._parse_usage(data.get("usage"))
 
-        return ChatResponse(
+        result = ChatResponse(
             content=content,
             provider=self.provider,
             model=data.get("model") or request.model or self.default_model,
@@ -74,6 +125,9 @@ class OpenAIAdapter(BaseAdapter):
             tool_calls=tool_calls,
             metadata={"id": data.get("id")},
         )
+        if cache_key is not None:
+            self.response_cache.set(cache_key, result)
+        return result
 
     async def stream_chat(self, request: ChatRequest) -> AsyncGenerator[StreamChunk, None]:
         api_key = self.credentials.get_api_key(Provider.OPENAI)
@@ -83,53 +137,65 @@ class OpenAIAdapter(BaseAdapter):
         payload = self._build_payload(request, stream=True)
         url = f"{self.base_url}/chat/completions"
 
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("POST", url, headers=self._headers(api_key), json=payload) as resp:
-                    resp.raise_for_status()
-                    async for raw_line in resp.aiter_lines():
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        if line.startswith("data:"):
-                            line = line[len("data:") :].strip()
-                        if line == "[DONE]":
-                            yield StreamChunk(delta="", is_done=True, provider=self.provider, model=payload["model"])
-                            break
-                        try:
-                            parsed = json.loads(line)
-                        except json.JSONDecodeError as exc:
-                            yield StreamChunk(
-                                delta="",
-                                is_done=False,
-                                provider=self.provider,
-                                model=payload["model"],
-                                error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
-                            )
-                            continue
-
-                        choice = (parsed.get("choices") or [{}])[0]
-                        delta = (choice.get("delta") or {}).get("content", "") or ""
-                        finish_reason = choice.get("finish_reason")
-                        usage = self._parse_usage(parsed.get("usage"))
-                        tool_calls = self._parse_tool_calls(choice.get("delta") or {})
-
+        client = await self._get_client()
+        try:
+            async with self.limiter, client.stream(
+                "POST",
+                url,
+                headers=self._headers(api_key),
+                content=fastjson.dumps(payload),
+                timeout=httpx.Timeout(None, connect=self.timeout),
+            ) as resp:
+                self.limiter.update_from_headers(resp.headers)
+                resp.raise_for_status()
+                tool_stream = _ToolCallAccumulator()
+                async for data in iter_sse_data(resp):
+                    if data == b"[DONE]":
+                        yield StreamChunk(delta="", is_done=True, provider=self.provider, model=payload["model"])
+                        break
+                    try:
+                        parsed = fastjson.loads(data)
+                    except fastjson.JSONDecodeError as exc:
                         yield StreamChunk(
-                            delta=delta,
-                            is_done=finish_reason is not None,
+                            delta="",
+                            is_done=False,
                             provider=self.provider,
-                            model=parsed.get("model") or payload["model"],
-                            usage=usage,
-                            tool_call=tool_calls[0] if tool_calls else None,
+                            model=payload["model"],
+                            error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
                         )
-            except httpx.HTTPError as exc:
-                yield StreamChunk(
-                    delta="",
-                    is_done=True,
-                    provider=self.provider,
-                    model=request.model or self.default_model,
-                    error=LLMExecutionException(f"OpenAI stream failed: {exc}"),
-                )
+                        continue
+
+                    choice = (parsed.get("choices") or [{}])[0]
+                    delta_obj = choice.get("delta") or {}
+                    delta = delta_obj.get("content", "") or ""
+                    finish_reason = choice.get("finish_reason")
+                    usage = self._parse_usage(parsed.get("usage"))
+                    model = parsed.get("model") or payload["model"]
+
+                    tool_call = tool_stream.feed(delta_obj.get("tool_calls"))
+                    if finish_reason is not None and tool_stream:
+                        tool_calls = tool_stream.finish()
+                        # StreamChunk carries one call; emit all but the last ahead of the final chunk.
+                        for extra in tool_calls[:-1]:
+                            yield StreamChunk(delta="", is_done=False, provider=self.provider, model=model, tool_call=extra)
+                        tool_call = tool_calls[-1] if tool_calls else None
+
+                    yield StreamChunk(
+                        delta=delta,
+                        is_done=finish_reason is not None,
+                        provider=self.provider,
+                        model=model,
+                        usage=usage,
+                        tool_call=tool_call,
+                    )
+        except httpx.HTTPError as exc:
+            yield StreamChunk(
+                delta="",
+                is_done=True,
+                provider=self.provider,
+                model=request.model or self.default_model,
+                error=LLMExecutionException(f"OpenAI stream failed: {exc}"),
+            )
 
     async def list_models(self) -> List[ModelInfo]:
         api_key = self.credentials.get_api_key(Provider.OPENAI)
@@ -137,14 +203,14 @@ class OpenAIAdapter(BaseAdapter):
             raise LLMUnavailableException("OPENAI_API_KEY not configured.")
 
         url = f"{self.base_url}/models"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url, headers=self._headers(api_key))
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Failed to list OpenAI models: {exc}") from exc
+        client = await self._get_client()
+        try:
+            resp = await client.get(url, headers=self._headers(api_key))
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Failed to list OpenAI models: {exc}") from exc
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         models = []
         for model in data.get("data", []):
             model_id = model.get("id")
@@ -153,14 +219,35 @@ class OpenAIAdapter(BaseAdapter):
         return models
 
     async def check_health(self) -> ProviderHealth:
-        try:
-            await self.list_models()
-            return ProviderHealth(provider=self.provider, status="healthy")
-        except LLMException:
+        api_key = self.credentials.get_api_key(Provider.OPENAI)
+        if not api_key:
             return ProviderHealth(provider=self.provider, status="down")
 
+        # Only the status matters; leave the model catalog body unread.
+        healthy = await self._probe_ok(f"{self.base_url}/models", headers=self._headers(api_key))
+        return ProviderHealth(provider=self.provider, status="healthy" if healthy else "down")
+
+    async def _post_with_retries(self, url: str, api_key: str, body: bytes) -> httpx.Response:
+        """POST under the limiter, retrying 429/5xx with jittered exponential backoff."""
+        client = await self._get_client()
+        attempt = 0
+        while True:
+            async with self.limiter:
+                response = await client.post(url, headers=self._headers(api_key), content=body)
+            self.limiter.update_from_headers(response.headers)
+            if response.status_code not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                response.raise_for_status()
+                return response
+            retry_after = parse_reset_duration(response.headers.get("retry-after"))
+            await asyncio.sleep(backoff_delay(attempt, retry_after=retry_after))
+            attempt += 1
+
     def _build_payload(self, request: ChatRequest, stream: bool) -> Dict[str, object]:
-        messages = [self._message_to_dict(m) for m in request.messages]
+        # Only messages carrying name/tool_call_id need the richer OpenAI shape.
+        messages = [
+            self._message_to_dict(m) if (m.name or m.tool_call_id) else prebuilt
+            for m, prebuilt in zip(request.messages, request.message_dicts())
+        ]
         payload: Dict[str, object] = {
             "model": request.model or self.default_model,
             "messages": messages,
@@ -180,11 +267,22 @@ class OpenAIAdapter(BaseAdapter):
             payload["stream_options"] = {"include_usage": True}
         return payload
 
+    def _cache_key_body(self, payload: Dict[str, object]) -> bytes:
+        """Serialize the payload with whitespace-normalized message content for cache keying."""
+        messages = [
+            {**m, "content": normalize_prompt_text(m["content"])} if isinstance(m.get("content"), str) else m
+            for m in payload["messages"]  # type: ignore[union-attr]
+        ]
+        return fastjson.dumps({**payload, "messages": messages})
+
     def _headers(self, api_key: str) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        # Rebuilt only when the key changes; httpx copies the mapping, so sharing it is safe.
+        if self._cached_headers is None or self._cached_headers[0] != api_key:
+            self._cached_headers = (
+                api_key,
+                {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            )
+        return self._cached_headers[1]
 
     def _message_to_dict(self, message: ChatMessage) -> Dict[str, object]:
         data: Dict[str, object] = {"role": message.role, "content": message.content}
@@ -200,38 +298,32 @@ class OpenAIAdapter(BaseAdapter):
         prompt = int(payload.get("prompt_tokens") or 0)
         completion = int(payload.get("completion_tokens") or 0)
         total = int(payload.get("total_tokens") or prompt + completion)
-        return Usage(prompt_tokens=prompt, completion_tokens=completion, total_tokens=total)
+        cached = int((payload.get("prompt_tokens_details") or {}).get("cached_tokens") or 0)
+        return Usage(prompt_tokens=prompt, completion_tokens=completion, total_tokens=total, cached_tokens=cached)
 
     def _parse_tool_calls(self, message: Dict[str, object]) -> List[ToolCall]:
         tool_calls: List[ToolCall] = []
-        for call in message.get("tool_calls") or []:
-            try:
-                arguments = call.get("function", {}).get("arguments") or "{}"
-                parsed_args = json.loads(arguments) if isinstance(arguments, str) else arguments
-                tool_calls.append(
-                    ToolCall(
-                        id=call.get("id") or "",
-                        name=call.get("function", {}).get("name") or "",
-                        arguments=parsed_args or {},
-                    )
-                )
-            except Exception:
-                continue
+        for call in message.get("tool_calls") or ():
+            func = call.get("function") or _EMPTY
+            arguments = func.get("arguments") or "{}"
+            if isinstance(arguments, str):
+                try:
+                    arguments = fastjson.loads(arguments)
+                except fastjson.JSONDecodeError:
+                    continue
+            tool_calls.append(ToolCall(id=call.get("id") or "", name=func.get("name") or "", arguments=arguments or {}))
         return tool_calls
 
     # --- Compatibility helpers for existing pipeline flows ---
 
     async def review_tasks(self, tasks_json: str, model: Optional[str] = None, extra_args: Optional[List[str]] = None) -> str:
         """Review and refine generated tasks."""
-        prompt = f"""Review these tasks and suggest improvements:
-
-Tasks:
-{tasks_json}
-
-Return refined tasks JSON with clearer descriptions and dependencies."""
         response = await self.chat(
             ChatRequest(
-                messages=[ChatMessage(role="user", content=prompt)],
+                messages=[
+                    ChatMessage(role="system", content=REVIEW_TASKS_PROMPT),
+                    ChatMessage(role="user", content=f"Tasks:\n{tasks_json}"),
+                ],
                 model=model or self.default_model,
                 temperature=0.2,
             )
@@ -242,47 +334,31 @@ Return refined tasks JSON with clearer descriptions and dependencies."""
         self, code: str, requirements: str, model: Optional[str] = None, extra_args: Optional[List[str]] = None
     ) -> Dict:
         """Review code and return approval/feedback JSON."""
-        prompt = f"""Review this code against requirements.
-
-Requirements:
-{requirements}
-
-Code:
-{code}
-
-Respond in JSON format:
-{{
-  "approved": true/false,
-  "feedback": "Detailed feedback",
-  "corrections": ["List of required corrections"]
-}}"""
         response = await self.chat(
             ChatRequest(
-                messages=[ChatMessage(role="user", content=prompt)],
+                messages=[
+                    ChatMessage(role="system", content=REVIEW_CODE_PROMPT),
+                    ChatMessage(role="user", content=f"Requirements:\n{requirements}\n\nCode:\n{code}"),
+                ],
                 model=model or self.default_model,
                 temperature=0.1,
             )
         )
         try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
+            return fastjson.loads(response.content)
+        except fastjson.JSONDecodeError:
             return {"approved": False, "feedback": response.content, "corrections": []}
 
     async def generate_correction(
         self, code: str, issue: str, model: Optional[str] = None, extra_args: Optional[List[str]] = None
     ) -> str:
         """Generate corrected code for a specified issue."""
-        prompt = f"""Fix this issue in the code.
-
-Issue: {issue}
-
-Code:
-{code}
-
-Return only the corrected code."""
         response = await self.chat(
             ChatRequest(
-                messages=[ChatMessage(role="user", content=prompt)],
+                messages=[
+                    ChatMessage(role="system", content=CORRECTION_PROMPT),
+                    ChatMessage(role="user", content=f"Issue: {issue}\n\nCode:\n{code}"),
+                ],
                 model=model or self.default_model,
                 temperature=0.2,
             )
@@ -290,5 +366,50 @@ Return only the corrected code."""
         return response.content
 
 
+class _ToolCallAccumulator:
+    """
+    Stitches streamed tool-call deltas, keyed by their ``index``.
+
+    Argument fragments are appended to a byte buffer and parsed once, when the stream
+    reports a finish reason, so per-delta work stays proportional to the delta rather
+    than to the arguments received so far.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[int, Tuple[List[str], bytearray]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def feed(self, deltas: Optional[Sequence[Dict[str, object]]]) -> Optional[ToolCall]:
+        """Absorb one chunk's deltas, returning a partial ToolCall for the last call touched."""
+        touched: Optional[ToolCall] = None
+        for call in deltas or ():
+            ident, args_buf = self._calls.setdefault(call.get("index", 0), (["", ""], bytearray()))
+            func = call.get("function") or _EMPTY
+            if call.get("id"):
+                ident[0] = call["id"]
+            if func.get("name"):
+                ident[1] = func["name"]
+            fragment = func.get("arguments")
+            if fragment:
+                args_buf += fragment.encode("utf-8")
+            touched = ToolCall(id=ident[0], name=ident[1], arguments=PARTIAL_ARGUMENTS)
+        return touched
+
+    def finish(self) -> List[ToolCall]:
+        """Parse each call's buffered arguments exactly once and reset."""
+        calls: List[ToolCall] = []
+        for index in sorted(self._calls):
+            (call_id, name), args_buf = self._calls[index]
+            try:
+                arguments = fastjson.loads(args_buf or b"{}")
+            except fastjson.JSONDecodeError:
+                continue
+            calls.append(ToolCall(id=call_id, name=name, arguments=arguments or {}))
+        self._calls = {}
+        return calls
+
+
 # Backwards compatibility alias for previous naming.
 CodexAdapter = OpenAIAdapter
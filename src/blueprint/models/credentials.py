@@ -8,42 +8,60 @@ from typing import Any, Dict, Optional
 from ..config import ConfigLoader
 from .base import Provider
 
+_ENV_VARS: Dict[Provider, tuple[str, ...]] = {
+    Provider.OPENAI: ("OPENAI_API_KEY",),
+    Provider.CLAUDE: ("ANTHROPIC_API_KEY",),
+    # Gemini also respects GOOGLE_GENERATIVE_AI_API_KEY
+    Provider.GEMINI: ("GEMINI_API_KEY", "GOOGLE_GENERATIVE_AI_API_KEY"),
+    Provider.OLLAMA: ("OLLAMA_API_KEY",),
+}
+
 
 class CredentialsManager:
     """Loads provider credentials from env or ~/.config/blueprint/credentials.toml."""
 
     def __init__(self, config: Optional[ConfigLoader] = None) -> None:
-        self.config = config or ConfigLoader()
+        self._config = config
+        # Resolved keys per provider; adapters look these up on every request.
+        self._keys: Dict[Provider, Optional[str]] = {}
+
+    @property
+    def config(self) -> ConfigLoader:
+        """Config loader, created on first use so env-only setups never read config files."""
+        if self._config is None:
+            self._config = ConfigLoader()
+        return self._config
 
     def get_api_key(self, provider: Provider) -> Optional[str]:
         """Return API key for provider, preferring env var overrides."""
-        env_var = {
-            Provider.OPENAI: "OPENAI_API_KEY",
-            Provider.CLAUDE: "ANTHROPIC_API_KEY",
-            Provider.GEMINI: "GEMINI_API_KEY",
-            Provider.OLLAMA: "OLLAMA_API_KEY",
-        }.get(provider)
-
-        # Gemini also respects GOOGLE_GENERATIVE_AI_API_KEY
-        if provider == Provider.GEMINI:
-            env_var = "GEMINI_API_KEY" if os.getenv("GEMINI_API_KEY") else "GOOGLE_GENERATIVE_AI_API_KEY"
+        if provider in self._keys:
+            return self._keys[provider]
 
-        if env_var and os.getenv(env_var):
-            return os.getenv(env_var)
+        key: Optional[str] = None
+        for env_var in _ENV_VARS.get(provider, ()):
+            key = os.environ.get(env_var)
+            if key:
+                break
+        if not key:
+            key = self.config.get_credential(provider.value, "api_key")
+        self._keys[provider] = key
+        return key
 
-        provider_key = provider.value
-        return self.config.get_credential(provider_key, "api_key")
+    def refresh(self) -> None:
+        """Forget resolved keys so the next lookup re-reads env vars and config."""
+        self._keys.clear()
 
     def get_base_url(self, provider: Provider, default: Optional[str] = None) -> Optional[str]:
         """Return base URL for provider if configured."""
-        if provider == Provider.OLLAMA and os.getenv("OLLAMA_HOST"):
-            return os.getenv("OLLAMA_HOST")
-        provider_key = provider.value
-        return self.config.get_credential(provider_key, "base_url") or default
+        if provider == Provider.OLLAMA:
+            host = os.environ.get("OLLAMA_HOST")
+            if host:
+                return host
+        return self.config.get_credential(provider.value, "base_url") or default
 
     def set_provider(self, provider: Provider, data: Dict[str, Any]) -> None:
-        """Persist credentials for a provider (best-effort)."""
-        # ConfigLoader handles credential files; for now, we update in-memory.
+        """Update credentials for a provider in memory; credentials.toml is left untouched."""
         if hasattr(self.config, "credentials"):
             providers = self.config.credentials.setdefault(provider.value, {})
             providers.update(data)
+        self._keys.pop(provider, None)
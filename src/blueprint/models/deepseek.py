@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator, Dict, List, Optional
+from typing import AsyncGenerator, ClassVar, Dict, Final, List, Optional, Tuple
 
 import httpx
 
@@ -21,12 +20,35 @@ from .base import (
     Usage,
 )
 from .credentials import CredentialsManager
+from .http import PooledClientMixin, check_status
+from .ratelimit import RequestLimiter
+from .sse import iter_json_lines
+from ..utils import fastjson
 
+# Compatibility-helper prompts; only the named slots vary per call.
+GENERATE_CODE_PROMPT: Final[str] = """Generate production-ready code for this task.
 
-class OllamaAdapter(BaseAdapter):
+Task: {task}
+
+Context:
+{context}"""
+
+REFACTOR_CODE_PROMPT: Final[str] = """Refactor this code according to the instructions.
+
+Instructions: {instructions}
+
+Code:
+{code}"""
+
+
+class OllamaAdapter(PooledClientMixin, BaseAdapter):
     """Adapter for local Ollama chat API."""
 
     provider = Provider.OLLAMA
+    # Local plain-HTTP server: h2 would only apply over TLS.
+    http2 = False
+    # A model's context window is fixed, so /api/show is asked once per (host, model).
+    _context_limits: ClassVar[Dict[Tuple[str, str], Optional[int]]] = {}
 
     def __init__(
         self,
@@ -34,24 +56,27 @@ class OllamaAdapter(BaseAdapter):
         default_model: str = "deepseek-coder:latest",
         base_url: str = "http://localhost:11434",
         timeout: float = 30.0,
+        max_concurrency: int = 4,
     ) -> None:
         self.credentials = credentials or CredentialsManager()
         self.default_model = default_model
         self.base_url = (self.credentials.get_base_url(Provider.OLLAMA, base_url) or base_url).rstrip("/")
         self.timeout = timeout
+        self.limiter = RequestLimiter(max_concurrency)
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         url = f"{self.base_url}/api/chat"
         payload = self._build_payload(request, stream=False)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
+        client = await self._get_client()
+        try:
+            async with self.limiter:
                 resp = await client.post(url, json=payload)
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Ollama request failed: {exc}") from exc
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Ollama request failed: {exc}") from exc
+        check_status(resp, "Ollama request")
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         message = data.get("message") or {}
         content = message.get("content") or data.get("response") or ""
 
@@ -67,61 +92,60 @@ class OllamaAdapter(BaseAdapter):
         url = f"{self.base_url}/api/chat"
         payload = self._build_payload(request, stream=True)
 
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("POST", url, json=payload) as resp:
-                    resp.raise_for_status()
-                    async for raw_line in resp.aiter_lines():
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        try:
-                            data = json.loads(line)
-                        except json.JSONDecodeError as exc:
-                            yield StreamChunk(
-                                delta="",
-                                is_done=False,
-                                provider=self.provider,
-                                model=payload["model"],
-                                error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
-                            )
-                            continue
-
-                        delta_text = ""
-                        if "message" in data and data["message"].get("content"):
-                            delta_text = data["message"]["content"]
-                        elif "response" in data and isinstance(data["response"], str):
-                            delta_text = data["response"]
-
-                        is_done = bool(data.get("done"))
+        client = await self._get_client()
+        try:
+            async with self.limiter, client.stream(
+                "POST", url, json=payload, timeout=httpx.Timeout(None, connect=self.timeout)
+            ) as resp:
+                resp.raise_for_status()
+                async for line in iter_json_lines(resp):
+                    try:
+                        data = fastjson.loads(line)
+                    except fastjson.JSONDecodeError as exc:
                         yield StreamChunk(
-                            delta=delta_text,
-                            is_done=is_done,
+                            delta="",
+                            is_done=False,
                             provider=self.provider,
                             model=payload["model"],
-                            usage=None,
+                            error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
                         )
-                        if is_done:
-                            break
-            except httpx.HTTPError as exc:
-                yield StreamChunk(
-                    delta="",
-                    is_done=True,
-                    provider=self.provider,
-                    model=payload["model"],
-                    error=LLMExecutionException(f"Ollama stream failed: {exc}"),
-                )
+                        continue
+
+                    delta_text = ""
+                    if "message" in data and data["message"].get("content"):
+                        delta_text = data["message"]["content"]
+                    elif "response" in data and isinstance(data["response"], str):
+                        delta_text = data["response"]
+
+                    is_done = bool(data.get("done"))
+                    yield StreamChunk(
+                        delta=delta_text,
+                        is_done=is_done,
+                        provider=self.provider,
+                        model=payload["model"],
+                        usage=None,
+                    )
+                    if is_done:
+                        break
+        except httpx.HTTPError as exc:
+            yield StreamChunk(
+                delta="",
+                is_done=True,
+                provider=self.provider,
+                model=payload["model"],
+                error=LLMExecutionException(f"Ollama stream failed: {exc}"),
+            )
 
     async def list_models(self) -> List[ModelInfo]:
         url = f"{self.base_url}/api/tags"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url)
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Failed to list Ollama models: {exc}") from exc
+        client = await self._get_client()
+        try:
+            resp = await client.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Failed to list Ollama models: {exc}") from exc
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         results: List[ModelInfo] = []
         for model in data.get("models", []):
             name = model.get("name")
@@ -130,14 +154,12 @@ class OllamaAdapter(BaseAdapter):
         return results
 
     async def check_health(self) -> ProviderHealth:
-        try:
-            await self.list_models()
-            return ProviderHealth(provider=self.provider, status="healthy")
-        except LLMException:
-            return ProviderHealth(provider=self.provider, status="down")
+        # /api/version is a few bytes; /api/tags lists every installed model.
+        healthy = await self._probe_ok(f"{self.base_url}/api/version")
+        return ProviderHealth(provider=self.provider, status="healthy" if healthy else "down")
 
     def _build_payload(self, request: ChatRequest, stream: bool) -> Dict[str, object]:
-        messages = [{"role": m.role, "content": m.content} for m in request.messages]
+        messages = request.message_dicts()
         payload: Dict[str, object] = {
             "model": request.model or self.default_model,
             "messages": messages,
@@ -151,12 +173,7 @@ class OllamaAdapter(BaseAdapter):
 
     async def generate_code(self, task_description: str, context: str = "") -> str:
         """Generate code for a task description."""
-        prompt = f"""Generate production-ready code for this task.
-
-Task: {task_description}
-
-Context:
-{context}"""
+        prompt = GENERATE_CODE_PROMPT.format(task=task_description, context=context)
         response = await self.chat(
             ChatRequest(
                 messages=[ChatMessage(role="user", content=prompt)],
@@ -168,12 +185,7 @@ Context:
 
     async def refactor_code(self, code: str, instructions: str) -> str:
         """Refactor existing code according to instructions."""
-        prompt = f"""Refactor this code according to the instructions.
-
-Instructions: {instructions}
-
-Code:
-{code}"""
+        prompt = REFACTOR_CODE_PROMPT.format(instructions=instructions, code=code)
         response = await self.chat(
             ChatRequest(
                 messages=[ChatMessage(role="user", content=prompt)],
@@ -185,21 +197,34 @@ Code:
 
     async def get_context_limit(self) -> Optional[int]:
         """Return context length if reported by Ollama."""
+        cache_key = (self.base_url, self.default_model)
+        if cache_key in self._context_limits:
+            return self._context_limits[cache_key]
+
         url = f"{self.base_url}/api/show"
         payload = {"name": self.default_model}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-                params = data.get("model_info") or data.get("parameters") or data
-                for key in ("context_length", "context", "ctx"):
-                    value = params.get(key) if isinstance(params, dict) else None
-                    if isinstance(value, int):
-                        return value
-            except httpx.HTTPError:
-                return None
-        return None
+        client = await self._get_client()
+        try:
+            resp = await client.post(url, json=payload)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            # Don't memoize failures; the server may just not be up yet.
+            return None
+
+        try:
+            data = fastjson.loads(resp.content)
+        except fastjson.JSONDecodeError:
+            return None
+        limit: Optional[int] = None
+        params = data.get("model_info") or data.get("parameters") or data
+        if isinstance(params, dict):
+            for key in ("context_length", "context", "ctx"):
+                value = params.get(key)
+                if isinstance(value, int):
+                    limit = value
+                    break
+        self._context_limits[cache_key] = limit
+        return limit
 
 
 # Backwards compatibility alias for previous DeepSeek naming.
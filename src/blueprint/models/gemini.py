@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator, Dict, List, Optional
+from typing import AsyncGenerator, Dict, Final, List, Optional, Tuple
 
 import httpx
 
@@ -21,9 +20,37 @@ from .base import (
     Usage,
 )
 from .credentials import CredentialsManager
+from .http import PooledClientMixin, check_status
+from .ratelimit import RequestLimiter
+from .sse import iter_sse_data
+from ..utils import fastjson
 
+_USER_ROLES = frozenset({"user", "system"})
 
-class GeminiAdapter(BaseAdapter):
+# Compatibility-helper prompts; only the named slots vary per call.
+PARSE_SPEC_PROMPT: Final[str] = """Convert this specification into structured JSON tasks.
+
+Specification:
+{spec}
+
+Return ONLY valid JSON array with tasks in this format:
+[
+  {{
+    "id": "task-1",
+    "title": "Task title",
+    "description": "Detailed description",
+    "type": "code|boilerplate|review|architecture"
+  }}
+]"""
+
+BOILERPLATE_PROMPT: Final[str] = """Generate production-ready boilerplate code for this task:
+
+{task}
+
+Provide complete, idiomatic code with any necessary scaffolding."""
+
+
+class GeminiAdapter(PooledClientMixin, BaseAdapter):
     """Adapter for Gemini generateContent API."""
 
     provider = Provider.GEMINI
@@ -34,26 +61,31 @@ class GeminiAdapter(BaseAdapter):
         default_model: str = "gemini-2.0-flash",
         base_url: str = "https://generativelanguage.googleapis.com/v1beta",
         timeout: float = 30.0,
+        max_concurrency: int = 8,
     ) -> None:
         self.credentials = credentials or CredentialsManager()
         self.default_model = default_model
         self.base_url = (self.credentials.get_base_url(Provider.GEMINI, base_url) or base_url).rstrip("/")
         self.timeout = timeout
+        self.limiter = RequestLimiter(max_concurrency)
+        self._cached_headers: Optional[Tuple[str, Dict[str, str]]] = None
+        self._last_usage: Tuple[Optional[Dict[str, object]], Optional[Usage]] = (None, None)
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         api_key = self._api_key()
         payload = self._build_payload(request)
         model = request.model or self.default_model
-        url = f"{self.base_url}/models/{model}:generateContent?key={api_key}"
+        url = f"{self.base_url}/models/{model}:generateContent"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.post(url, json=payload)
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Gemini request failed: {exc}") from exc
+        client = await self._get_client()
+        try:
+            async with self.limiter:
+                resp = await client.post(url, headers=self._headers(api_key), json=payload)
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Gemini request failed: {exc}") from exc
+        check_status(resp, "Gemini request")
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         text = self._extract_text(data)
         usage = self._parse_usage(data.get("usageMetadata"))
 
@@ -70,64 +102,65 @@ class GeminiAdapter(BaseAdapter):
         api_key = self._api_key()
         payload = self._build_payload(request)
         model = request.model or self.default_model
-        url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
-
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("POST", url, json=payload) as resp:
-                    resp.raise_for_status()
-                    async for raw_line in resp.aiter_lines():
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        if line.startswith("data:"):
-                            line = line[len("data:") :].strip()
-                        if line == "[DONE]":
-                            yield StreamChunk(delta="", is_done=True, provider=self.provider, model=model)
-                            break
-                        try:
-                            data = json.loads(line)
-                        except json.JSONDecodeError as exc:
-                            yield StreamChunk(
-                                delta="",
-                                is_done=False,
-                                provider=self.provider,
-                                model=model,
-                                error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
-                            )
-                            continue
-
-                        delta_text = self._extract_text(data)
-                        usage = self._parse_usage(data.get("usageMetadata"))
+        url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse"
 
+        client = await self._get_client()
+        try:
+            async with self.limiter, client.stream(
+                "POST",
+                url,
+                headers=self._headers(api_key),
+                json=payload,
+                timeout=httpx.Timeout(None, connect=self.timeout),
+            ) as resp:
+                resp.raise_for_status()
+                async for line in iter_sse_data(resp):
+                    if line == b"[DONE]":
+                        yield StreamChunk(delta="", is_done=True, provider=self.provider, model=model)
+                        break
+                    try:
+                        data = fastjson.loads(line)
+                    except fastjson.JSONDecodeError as exc:
                         yield StreamChunk(
-                            delta=delta_text,
+                            delta="",
                             is_done=False,
                             provider=self.provider,
                             model=model,
-                            usage=usage,
+                            error=LLMExecutionException(f"Malformed stream chunk: {exc}"),
                         )
-            except httpx.HTTPError as exc:
-                yield StreamChunk(
-                    delta="",
-                    is_done=True,
-                    provider=self.provider,
-                    model=model,
-                    error=LLMExecutionException(f"Gemini stream failed: {exc}"),
-                )
+                        continue
+
+                    delta_text = self._extract_text(data)
+                    usage = self._parse_usage(data.get("usageMetadata"))
+
+                    yield StreamChunk(
+                        delta=delta_text,
+                        is_done=False,
+                        provider=self.provider,
+                        model=model,
+                        usage=usage,
+                    )
+        except httpx.HTTPError as exc:
+            yield StreamChunk(
+                delta="",
+                is_done=True,
+                provider=self.provider,
+                model=model,
+                error=LLMExecutionException(f"Gemini stream failed: {exc}"),
+            )
 
     async def list_models(self) -> List[ModelInfo]:
         api_key = self._api_key()
-        url = f"{self.base_url}/models?key={api_key}"
+        url = f"{self.base_url}/models"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url)
-                resp.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise LLMExecutionException(f"Failed to list Gemini models: {exc}") from exc
+        client = await self._get_client()
+        try:
+            resp = await client.get(url, headers=self._headers(api_key))
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMExecutionException(f"Failed to list Gemini models: {exc}") from exc
 
-        data = resp.json()
+        data = fastjson.loads(resp.content)
         results: List[ModelInfo] = []
         for model in data.get("models", []):
             model_id = model.get("name") or model.get("id")
@@ -138,41 +171,47 @@ class GeminiAdapter(BaseAdapter):
         return results
 
     async def check_health(self) -> ProviderHealth:
-        try:
-            await self.list_models()
-            return ProviderHealth(provider=self.provider, status="healthy")
-        except LLMException:
+        api_key = self.credentials.get_api_key(Provider.GEMINI)
+        if not api_key:
             return ProviderHealth(provider=self.provider, status="down")
+        healthy = await self._probe_ok(f"{self.base_url}/models?pageSize=1", headers=self._headers(api_key))
+        return ProviderHealth(provider=self.provider, status="healthy" if healthy else "down")
 
     def _build_payload(self, request: ChatRequest) -> Dict[str, object]:
-        contents: List[Dict[str, object]] = []
-        for message in request.messages:
-            role = "user" if message.role == "user" else "model"
-            if message.role == "system":
-                role = "user"
-            contents.append(
-                {
-                    "role": role,
-                    "parts": [{"text": message.content}],
-                }
-            )
+        # Gemini only knows "user" and "model"; system and user turns both go in as "user".
+        contents = [
+            {"role": "user" if m.role in _USER_ROLES else "model", "parts": [{"text": m.content}]}
+            for m in request.messages
+        ]
 
-        payload: Dict[str, object] = {"contents": contents}
+        generation_config: Dict[str, object] = {}
         if request.temperature is not None:
-            payload["temperature"] = request.temperature
+            generation_config["temperature"] = request.temperature
         if request.max_tokens is not None:
-            payload["generationConfig"] = {"maxOutputTokens": request.max_tokens}
+            generation_config["maxOutputTokens"] = request.max_tokens
         if request.top_p is not None:
-            payload.setdefault("generationConfig", {})
-            payload["generationConfig"]["topP"] = request.top_p
+            generation_config["topP"] = request.top_p
         if request.stop:
-            payload.setdefault("generationConfig", {})
-            payload["generationConfig"]["stopSequences"] = list(request.stop)
+            generation_config["stopSequences"] = list(request.stop)
+
+        payload: Dict[str, object] = {"contents": contents}
+        if generation_config:
+            payload["generationConfig"] = generation_config
         if request.tools:
             payload["tools"] = list(request.tools)
         return payload
 
     def _extract_text(self, data: Dict[str, object]) -> str:
+        # Fast path: steady-state stream events carry one candidate with a single text part.
+        try:
+            parts = data["candidates"][0]["content"]["parts"]
+            if len(parts) == 1:
+                text = parts[0].get("text")
+                if text:
+                    return text
+        except (KeyError, IndexError, TypeError, AttributeError):
+            pass
+
         candidates = data.get("candidates") or []
         for candidate in candidates:
             parts = (candidate.get("content") or {}).get("parts") or []
@@ -188,10 +227,22 @@ class GeminiAdapter(BaseAdapter):
     def _parse_usage(self, payload: Optional[Dict[str, object]]) -> Optional[Usage]:
         if not payload:
             return None
+        # Streams repeat the cumulative usageMetadata on every event; reuse the last parse.
+        if payload == self._last_usage[0]:
+            return self._last_usage[1]
         prompt = int(payload.get("promptTokenCount") or 0)
         completion = int(payload.get("candidatesTokenCount") or payload.get("totalTokenCount") or 0)
         total = int(payload.get("totalTokenCount") or prompt + completion)
-        return Usage(prompt_tokens=prompt, completion_tokens=completion, total_tokens=total)
+        cached = int(payload.get("cachedContentTokenCount") or 0)
+        usage = Usage(prompt_tokens=prompt, completion_tokens=completion, total_tokens=total, cached_tokens=cached)
+        self._last_usage = (payload, usage)
+        return usage
+
+    def _headers(self, api_key: str) -> Dict[str, str]:
+        # Sent as a header rather than ?key= so the key stays out of URLs, logs and error messages.
+        if self._cached_headers is None or self._cached_headers[0] != api_key:
+            self._cached_headers = (api_key, {"x-goog-api-key": api_key})
+        return self._cached_headers[1]
 
     def _api_key(self) -> str:
         api_key = self.credentials.get_api_key(Provider.GEMINI)
@@ -205,20 +256,7 @@ class GeminiAdapter(BaseAdapter):
         self, spec: str, model: Optional[str] = None, sandbox: bool = False, output_format: Optional[str] = None
     ) -> str:
         """Parse a specification into a tasks JSON array."""
-        prompt = f"""Convert this specification into structured JSON tasks.
-
-Specification:
-{spec}
-
-Return ONLY valid JSON array with tasks in this format:
-[
-  {{
-    "id": "task-1",
-    "title": "Task title",
-    "description": "Detailed description",
-    "type": "code|boilerplate|review|architecture"
-  }}
-]"""
+        prompt = PARSE_SPEC_PROMPT.format(spec=spec)
         response = await self.chat(
             ChatRequest(
                 messages=[ChatMessage(role="user", content=prompt)],
@@ -232,11 +270,7 @@ Return ONLY valid JSON array with tasks in this format:
         self, task_description: str, model: Optional[str] = None, sandbox: bool = False, output_format: Optional[str] = None
     ) -> str:
         """Generate boilerplate code for a task description."""
-        prompt = f"""Generate production-ready boilerplate code for this task:
-
-{task_description}
-
-Provide complete, idiomatic code with any necessary scaffolding."""
+        prompt = BOILERPLATE_PROMPT.format(task=task_description)
         response = await self.chat(
             ChatRequest(
                 messages=[ChatMessage(role="user", content=prompt)],
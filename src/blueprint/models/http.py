@@ -0,0 +1,71 @@
+"""Pooled httpx client shared by the HTTP-backed provider adapters."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import ClassVar, Mapping, Optional
+
+import httpx
+
+from .base import LLMExecutionException
+
+try:  # HTTP/2 needs the optional h2 package (installed via httpx[http2])
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    HTTP2_AVAILABLE = False
+
+
+class PooledClientMixin:
+    """
+    Gives an adapter one keep-alive ``httpx.AsyncClient`` reused across requests.
+
+    The client is built lazily inside a running loop and rebuilt when the loop changes:
+    callers such as the executor use separate ``asyncio.run`` calls, and pooled
+    connections cannot outlive the loop that opened them.
+    """
+
+    timeout: float
+    http2: ClassVar[bool] = HTTP2_AVAILABLE
+    pool_limits: ClassVar[httpx.Limits] = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+    _client: Optional[httpx.AsyncClient] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, rebuilding it if the event loop has changed."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            # Connections from a previous asyncio.run() are bound to a dead loop; drop them.
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.pool_limits, http2=self.http2)
+            self._client_loop = loop
+        return self._client
+
+    async def _probe_ok(self, url: str, headers: Optional[Mapping[str, str]] = None) -> bool:
+        """True if GET ``url`` succeeds; the response body is never read."""
+        client = await self._get_client()
+        try:
+            async with client.stream("GET", url, headers=headers) as resp:
+                return resp.is_success
+        except httpx.HTTPError:
+            return False
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+def check_status(resp: httpx.Response, action: str) -> None:
+    """Raise LLMExecutionException for an HTTP error, quoting at most 256 bytes of the body."""
+    if resp.status_code >= 400:
+        raise LLMExecutionException(f"{action} failed: HTTP {resp.status_code}: {resp.content[:256]!r}")
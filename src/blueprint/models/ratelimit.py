@@ -0,0 +1,97 @@
+"""Client-side concurrency limiting and request pacing for provider adapters."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import time
+from typing import Mapping, Optional
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset values such as ``"1s"``, ``"6m0s"``, ``"20ms"`` or ``"2.5"`` into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter, honouring a server-provided Retry-After."""
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class RequestLimiter:
+    """
+    Bounds in-flight requests and paces them against a requests-per-minute budget.
+
+    Use as ``async with limiter:`` around each request. Pacing uses a reservation-style
+    token bucket, so no lock is needed: each caller takes a token up front and sleeps
+    off any deficit. Rate-limit response headers can pause all callers until the
+    server's window resets.
+    """
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: Optional[float] = None) -> None:
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self._tokens = float(requests_per_minute or 0)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def __aenter__(self) -> "RequestLimiter":
+        await self._bound_semaphore().acquire()
+        try:
+            await self._pace()
+        except BaseException:
+            self._bound_semaphore().release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._bound_semaphore().release()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Pause new requests when the server reports an exhausted request budget."""
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is None or remaining.strip() not in {"0", "0.0"}:
+            return
+        reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        if reset:
+            self._paused_until = max(self._paused_until, time.monotonic() + reset)
+
+    def _bound_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            # Semaphores bind to the loop that first waits on them; start fresh per loop.
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _pace(self) -> None:
+        now = time.monotonic()
+        delay = max(0.0, self._paused_until - now)
+        if self.requests_per_minute:
+            rate = self.requests_per_minute / 60.0
+            self._tokens = min(self.requests_per_minute, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / rate)
+        if delay > 0:
+            await asyncio.sleep(delay)
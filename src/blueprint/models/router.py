@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from enum import Enum
+from functools import cached_property
 from typing import Dict, Optional
 
 from ..config import ConfigLoader
@@ -25,38 +28,64 @@ class ModelRole(Enum):
 class ModelRouter:
     """Route tasks to the most suitable provider."""
 
+    HEALTH_TTL_SECONDS = 30.0
+
     def __init__(self, config: ConfigLoader) -> None:
         self.config = config
-        creds = CredentialsManager(config)
+        self._credentials = CredentialsManager(config)
+        self.max_chars_local = config.get("backends.ollama.max_context_tokens", 20000)
+        self._health_cache: Dict[Provider, str] = {}
+        self._health_checked_at: Dict[Provider, float] = {}
+        self._health_inflight: Dict[Provider, asyncio.Task] = {}
 
-        self.claude = ClaudeAdapter(
-            credentials=creds,
-            default_model=config.get("backends.claude.model", "claude-sonnet-4.5-20250929"),
-        )
-        self.gemini = GeminiAdapter(
-            credentials=creds,
-            default_model=config.get("backends.gemini.model", "gemini-2-flash"),
+    # Adapters are built on first use, so flows that only ever route to one provider skip
+    # constructing the rest. Each is built once per router, so its limiter bounds in-flight
+    # calls per provider over that adapter's single pooled client.
+
+    @cached_property
+    def claude(self) -> ClaudeAdapter:
+        return ClaudeAdapter(
+            credentials=self._credentials,
+            default_model=self.config.get("backends.claude.model", "claude-sonnet-4.5-20250929"),
+            max_concurrency=self.config.get("backends.claude.max_concurrency", 8),
         )
-        self.ollama = OllamaAdapter(
-            credentials=creds,
-            default_model=config.get("backends.ollama.model", "deepseek-coder:latest"),
+
+    @cached_property
+    def gemini(self) -> GeminiAdapter:
+        return GeminiAdapter(
+            credentials=self._credentials,
+            default_model=self.config.get("backends.gemini.model", "gemini-2-flash"),
+            max_concurrency=self.config.get("backends.gemini.max_concurrency", 8),
         )
-        self.openai = OpenAIAdapter(
-            credentials=creds,
-            default_model=config.get("backends.openai.model", "gpt-4o"),
+
+    @cached_property
+    def ollama(self) -> OllamaAdapter:
+        return OllamaAdapter(
+            credentials=self._credentials,
+            default_model=self.config.get("backends.ollama.model", "deepseek-coder:latest"),
+            max_concurrency=self.config.get("backends.ollama.max_concurrency", 4),
         )
 
-        self.max_chars_local = config.get("backends.ollama.max_context_tokens", 20000)
-        self._health_cache: Dict[Provider, str] = {}
+    @cached_property
+    def openai(self) -> OpenAIAdapter:
+        return OpenAIAdapter(
+            credentials=self._credentials,
+            default_model=self.config.get("backends.openai.model", "gpt-4o"),
+            max_concurrency=self.config.get("backends.openai.max_concurrency", 8),
+            cache_enabled=bool(self.config.get("cache.enabled", True)),
+            normalize_cache_keys=bool(self.config.get("cache.normalize_keys", False)),
+        )
 
     async def check_availability(self) -> None:
-        """Run lightweight health checks."""
-        for adapter in (self.ollama, self.claude, self.gemini, self.openai):
-            try:
-                health = await adapter.check_health()
-                self._health_cache[adapter.provider] = health.status
-            except Exception:
-                self._health_cache[adapter.provider] = "down"
+        """Run lightweight health checks against every provider concurrently."""
+        adapters = (self.ollama, self.claude, self.gemini, self.openai)
+        await asyncio.gather(*(self._probe(adapter, force=True) for adapter in adapters))
+
+    async def aclose(self) -> None:
+        """Close the adapters' pooled HTTP connections."""
+        # Only adapters that were actually built hold connections.
+        built = [self.__dict__[name] for name in ("ollama", "claude", "gemini", "openai") if name in self.__dict__]
+        await asyncio.gather(*(adapter.aclose() for adapter in built), return_exceptions=True)
 
     async def route(self, role: ModelRole, content_size: int = 0) -> BaseAdapter:
         """Route to an adapter based on role and context size."""
@@ -92,12 +121,26 @@ class ModelRouter:
         }
 
     async def _is_ollama_available(self) -> bool:
-        if self._health_cache.get(Provider.OLLAMA) == "healthy":
-            return True
+        return await self._probe(self.ollama) == "healthy"
+
+    async def _probe(self, adapter: BaseAdapter, force: bool = False) -> str:
+        """Return the provider's health, reusing a fresh result or a check already in flight."""
+        provider = adapter.provider
+        checked_at = self._health_checked_at.get(provider)
+        if not force and checked_at is not None and time.monotonic() - checked_at < self.HEALTH_TTL_SECONDS:
+            return self._health_cache[provider]
+
+        task = self._health_inflight.get(provider)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._run_health_check(adapter))
+            self._health_inflight[provider] = task
+        return await asyncio.shield(task)
+
+    async def _run_health_check(self, adapter: BaseAdapter) -> str:
         try:
-            health = await self.ollama.check_health()
-            self._health_cache[Provider.OLLAMA] = health.status
-            return health.status == "healthy"
+            status = (await adapter.check_health()).status
         except Exception:
-            self._health_cache[Provider.OLLAMA] = "down"
-            return False
+            status = "down"
+        self._health_cache[adapter.provider] = status
+        self._health_checked_at[adapter.provider] = time.monotonic()
+        return status
@@ -0,0 +1,63 @@
+"""Byte-level framing for server-sent event and newline-delimited JSON streams."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, List
+
+import httpx
+
+
+async def iter_sse_data(resp: httpx.Response, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """
+    Yield the ``data:`` payload of each server-sent event as raw bytes.
+
+    Framing happens on the undecoded body so payloads can go straight to a bytes-aware
+    JSON decoder. Multi-line data fields are joined with newlines per the SSE spec;
+    ``event:``/``id:``/comment lines are skipped.
+    """
+    buffer = bytearray()
+    data: List[bytes] = []
+    async for chunk in resp.aiter_bytes(chunk_size):
+        buffer += chunk
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", start)
+            if newline == -1:
+                break
+            line = bytes(buffer[start:newline]).rstrip(b"\r")
+            start = newline + 1
+            if not line:
+                if data:
+                    yield b"\n".join(data)
+                    data = []
+            elif line.startswith(b"data:"):
+                data.append(line[5:].lstrip())
+        # Drop consumed bytes once per network chunk rather than once per line.
+        del buffer[:start]
+
+    tail = bytes(buffer).rstrip(b"\r")
+    if tail.startswith(b"data:"):
+        data.append(tail[5:].lstrip())
+    if data:
+        yield b"\n".join(data)
+
+
+async def iter_json_lines(resp: httpx.Response, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """Yield each non-blank line of a newline-delimited JSON body as raw bytes."""
+    buffer = bytearray()
+    async for chunk in resp.aiter_bytes(chunk_size):
+        buffer += chunk
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", start)
+            if newline == -1:
+                break
+            line = bytes(buffer[start:newline]).strip()
+            start = newline + 1
+            if line:
+                yield line
+        del buffer[:start]
+
+    tail = bytes(buffer).strip()
+    if tail:
+        yield tail
@@ -7,6 +7,7 @@ from typing import AsyncGenerator, Iterable, List, Optional, Sequence
 
 from .base import BaseAdapter, ChatRequest, StreamChunk
 from .base import LLMExecutionException
+from ..utils import fastjson
 
 
 class StreamHandler:
@@ -24,40 +25,56 @@ class StreamHandler:
         expect_json: bool = False,
     ) -> AsyncGenerator[StreamChunk, None]:
         """Yield normalized chunks; retry or fallback on failure."""
-        attempts = 0
         adapters: List[BaseAdapter] = [adapter]
         if fallback_adapters:
             adapters.extend(fallback_adapters)
 
+        last_error: Optional[Exception] = None
         for current_adapter in adapters:
-            while attempts <= self.max_retries:
+            attempts = 0
+            while True:
+                # Error chunks end the attempt directly; exceptions from the adapter (transport,
+                # malformed payloads) are caught below and retried the same way.
+                error: Optional[Exception] = None
+                collected: List[str] = []
+                scanner = _JsonShapeScanner() if expect_json else None
+                stream = current_adapter.stream_chat(request)
                 try:
-                    collected: List[str] = []
-                    async for chunk in current_adapter.stream_chat(request):
-                        # Basic structural validation
-                        if chunk.error:
-                            raise chunk.error
+                    async for chunk in stream:
+                        if chunk.error is not None:
+                            error = chunk.error
+                            break
                         if chunk.delta:
+                            if scanner is not None:
+                                problem = scanner.feed(chunk.delta)
+                                if problem:
+                                    # Abandon a doomed generation as soon as its shape breaks.
+                                    error = LLMExecutionException(f"Invalid JSON output: {problem}")
+                                    break
                             collected.append(chunk.delta)
                         yield chunk
-                    # Post-stream validation
+                except Exception as exc:
+                    error = exc
+                finally:
+                    # Release the connection and limiter slot now rather than at garbage collection.
+                    aclose = getattr(stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+
+                # Post-stream validation
+                if error is None:
                     if not collected:
-                        raise LLMExecutionException("Stream produced no content")
-                    if expect_json:
-                        self._validate_json("".join(collected))
+                        error = LLMExecutionException("Stream produced no content")
+                    elif expect_json:
+                        error = self._validate_json("".join(collected))
+                if error is None:
                     return
-                except Exception as exc:
-                    attempts += 1
-                    if attempts > self.max_retries:
-                        yield StreamChunk(
-                            delta="",
-                            is_done=True,
-                            provider=current_adapter.provider,
-                            model=request.model,
-                            error=LLMExecutionException(str(exc)),
-                        )
-                        break
-                    await asyncio.sleep(self.backoff_seconds * attempts)
+
+                last_error = error
+                attempts += 1
+                if attempts > self.max_retries:
+                    break
+                await asyncio.sleep(self.backoff_seconds * attempts)
             # Move to next adapter if available
         # If we exhausted adapters and retries without success, emit terminal chunk
         yield StreamChunk(
@@ -65,14 +82,69 @@ class StreamHandler:
             is_done=True,
             provider=adapter.provider,
             model=request.model,
-            error=LLMExecutionException("Streaming failed after retries/fallbacks"),
+            error=LLMExecutionException(f"Streaming failed after retries/fallbacks: {last_error}"),
         )
 
-    def _validate_json(self, payload: str) -> None:
+    def _validate_json(self, payload: str) -> Optional[LLMExecutionException]:
         """Basic JSON validation for streams expected to return structured output."""
-        import json
-
         try:
-            json.loads(payload)
-        except json.JSONDecodeError as exc:  # pragma: no cover - lightweight guard
-            raise LLMExecutionException(f"Invalid JSON output: {exc}") from exc
+            fastjson.loads(payload)
+        except fastjson.JSONDecodeError as exc:  # pragma: no cover - lightweight guard
+            return LLMExecutionException(f"Invalid JSON output: {exc}")
+        return None
+
+
+class _JsonShapeScanner:
+    """
+    Incrementally checks the bracket/string structure of a streamed JSON document.
+
+    This is not a full parser: it only catches the failures visible from structure
+    alone (prose before the value, mismatched brackets, data after the value) so a
+    stream can be abandoned early. The final text still gets a real parse.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+
+    def __init__(self) -> None:
+        self._expected: List[str] = []
+        self._started = False
+        self._done = False
+        self._scalar = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Optional[str]:
+        """Consume the next delta; return a description of the first problem found, if any."""
+        if self._scalar:
+            return None
+        for char in text:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char in " \t\r\n":
+                continue
+            if self._done:
+                return "unexpected data after the JSON value"
+            if not self._started:
+                self._started = True
+                if char not in self._CLOSERS:
+                    if char in '"-0123456789tfn':
+                        # Top-level scalars are left to the final parse.
+                        self._scalar = True
+                        return None
+                    return f"unexpected {char!r} before the JSON value"
+            if char == '"':
+                self._in_string = True
+            elif char in self._CLOSERS:
+                self._expected.append(self._CLOSERS[char])
+            elif char in "}]":
+                if not self._expected or self._expected.pop() != char:
+                    return f"mismatched {char!r}"
+                if not self._expected:
+                    self._done = True
+        return None
@@ -3,18 +3,33 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import concurrent.futures
+import mmap
+import os
+import re
+import stat
 import subprocess
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime
+from fnmatch import translate
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, MutableMapping, Optional, Sequence
+from typing import Any, BinaryIO, Callable, ClassVar, Dict, MutableMapping, Optional, Sequence
 
 from ..config import ConfigLoader
+from ..utils import fastjson
+from .base import _SLOTS
 
 ToolHandler = Callable[[MutableMapping[str, Any]], Any]
 
+AUDIT_BUFFER_BYTES = 64 * 1024
+AUDIT_FLUSH_EVERY = 100
+MMAP_READ_THRESHOLD = 1024 * 1024
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Tool:
     name: str
     description: str
@@ -28,7 +43,7 @@ class Tool:
         return {"name": self.name, "description": self.description, "parameters": self.parameters}
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ToolResult:
     tool_call_id: str
     result: Any
@@ -42,39 +57,82 @@ class PermissionManager:
     def __init__(self, config: Optional[ConfigLoader] = None) -> None:
         self.config = config or ConfigLoader()
         self.approval_callback: Callable[[str, Tool, MutableMapping[str, Any]], bool] | None = None
-        self.auto_approve_patterns: Sequence[str] = self.config.get("tools.auto_approve", []) or []
+        # Tools can run concurrently; their approval prompts must not interleave.
+        self._approval_lock = threading.Lock()
+        self.auto_approve_patterns = self.config.get("tools.auto_approve", []) or []
+
+    @property
+    def auto_approve_patterns(self) -> Sequence[str]:
+        return self._auto_approve_patterns
+
+    @auto_approve_patterns.setter
+    def auto_approve_patterns(self, patterns: Sequence[str]) -> None:
+        self._auto_approve_patterns = patterns
+        self._compiled = _compile_patterns(patterns)
 
     def set_approval_callback(self, callback: Callable[[str, Tool, MutableMapping[str, Any]], bool]) -> None:
         self.approval_callback = callback
 
     def request_approval(self, tool_name: str, tool: Tool, args: MutableMapping[str, Any]) -> bool:
-        if self.approval_callback:
-            return self.approval_callback(tool_name, tool, args)
-        # CLI fallback
-        print(f"\n🔧 Tool execution request: {tool_name}\nArgs: {args}")
-        response = input("Approve? (y/n): ")
-        return response.strip().lower() == "y"
+        with self._approval_lock:
+            if self.approval_callback:
+                return self.approval_callback(tool_name, tool, args)
+            # CLI fallback
+            print(f"\n🔧 Tool execution request: {tool_name}\nArgs: {args}")
+            response = input("Approve? (y/n): ")
+            return response.strip().lower() == "y"
 
     def is_whitelisted(self, tool_name: str, args: MutableMapping[str, Any]) -> bool:
-        from fnmatch import fnmatch
-
-        for pattern in self.auto_approve_patterns:
-            parts = pattern.split(":", 1)
-            tool_pattern = parts[0]
-            if tool_pattern not in (tool_name, "**"):
+        path_arg = args.get("path")
+        for key in (tool_name, "**"):
+            rule = self._compiled.get(key)
+            if rule is None:
                 continue
-            if len(parts) == 1:
+            if rule is True:
                 return True
-            arg_pattern = parts[1]
-            path_arg = args.get("path")
-            if path_arg and fnmatch(str(path_arg), arg_pattern):
+            if path_arg and rule.match(str(path_arg)):
                 return True
         return False
 
 
+def _compile_patterns(patterns: Sequence[str]) -> Dict[str, re.Pattern[str] | bool]:
+    """
+    Group ``tool[:glob]`` rules by tool and fold each tool's globs into one regex.
+
+    A bare tool name approves every call, which is stored as ``True``.
+    """
+    globs: Dict[str, list[str]] = {}
+    allow_all: set[str] = set()
+    for pattern in patterns:
+        tool_pattern, sep, arg_pattern = pattern.partition(":")
+        if not sep:
+            allow_all.add(tool_pattern)
+        else:
+            globs.setdefault(tool_pattern, []).append(translate(arg_pattern))
+    compiled: Dict[str, re.Pattern[str] | bool] = {tool: re.compile("|".join(parts)) for tool, parts in globs.items()}
+    compiled.update(dict.fromkeys(allow_all, True))
+    return compiled
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
 class ToolEngine:
     """Registers and executes tools with optional approval gating."""
 
+    # Permission check per mode; unknown modes fall back to manual approval.
+    _ENFORCERS: ClassVar[Dict[str, str]] = {
+        "deny": "_enforce_deny",
+        "trust": "_enforce_trust",
+        "auto": "_enforce_auto",
+        "manual": "_enforce_manual",
+    }
+
     def __init__(self, config: Optional[ConfigLoader] = None) -> None:
         self.config = config or ConfigLoader()
         self.permission_mode = self.config.get("tools.permission_mode", "manual")
@@ -82,10 +140,25 @@ class ToolEngine:
         self._registry: Dict[str, Tool] = {}
         self._whitelist: set[str] = set()
         self._audit_log: Optional[Path] = None
+        self._audit_fp: Optional[BinaryIO] = None
+        self._audit_pending = 0
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
         self._register_builtin_tools()
 
+    @property
+    def permission_mode(self) -> str:
+        return self._permission_mode
+
+    @permission_mode.setter
+    def permission_mode(self, mode: str) -> None:
+        # Resolve the check once here so execute_tool makes a single call per tool run.
+        self._permission_mode = mode
+        self._enforce_permissions = getattr(self, self._ENFORCERS.get(mode, "_enforce_manual"))
+
     def set_mode(self, mode: str) -> None:
-        if mode not in {"manual", "auto", "deny", "trust"}:
+        if mode not in self._ENFORCERS:
             raise ValueError("Mode must be 'manual', 'auto', 'deny', or 'trust'")
         self.permission_mode = mode
 
@@ -119,26 +192,56 @@ class ToolEngine:
         return result
 
     def enable_audit(self, log_path: Path) -> None:
+        """Append JSONL audit entries to ``log_path`` through one long-lived buffered handle."""
+        if self._audit_fp is not None:
+            if log_path == self._audit_log:
+                return
+            self._close_audit()
         self._audit_log = log_path
         self._audit_log.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._audit_fp = log_path.open("ab", buffering=AUDIT_BUFFER_BYTES)
+        except OSError:
+            self._audit_fp = None
+            return
+        atexit.register(self._close_audit)
+
+    def flush_audit(self) -> None:
+        """Push buffered audit entries to disk."""
+        self._audit_pending = 0
+        if self._audit_fp is None:
+            return
+        try:
+            self._audit_fp.flush()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Shut down the worker pool and handler loop, then flush the audit log."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        atexit.unregister(self.close)
+        self._close_audit()
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
-    def _enforce_permissions(self, tool: Tool, args: MutableMapping[str, Any]) -> None:
-        if self.permission_mode == "deny":
-            raise PermissionError("Tool execution denied by policy.")
+    def _enforce_deny(self, tool: Tool, args: MutableMapping[str, Any]) -> None:
+        raise PermissionError("Tool execution denied by policy.")
 
-        if self.permission_mode == "trust":
-            return
+    def _enforce_trust(self, tool: Tool, args: MutableMapping[str, Any]) -> None:
+        return None
 
-        if self.permission_mode == "auto":
-            if tool.requires_approval and tool.name not in self._whitelist:
-                if not self.permission_manager.is_whitelisted(tool.name, args):
-                    raise PermissionError(f"Tool {tool.name} not whitelisted for auto execution.")
-            return
+    def _enforce_auto(self, tool: Tool, args: MutableMapping[str, Any]) -> None:
+        if tool.requires_approval and tool.name not in self._whitelist:
+            if not self.permission_manager.is_whitelisted(tool.name, args):
+                raise PermissionError(f"Tool {tool.name} not whitelisted for auto execution.")
 
-        # manual mode
+    def _enforce_manual(self, tool: Tool, args: MutableMapping[str, Any]) -> None:
         if tool.requires_approval and tool.name not in self._whitelist:
             approved = self.permission_manager.request_approval(tool.name, tool, args)
             if not approved:
@@ -147,31 +250,72 @@ class ToolEngine:
     def _execute_sandboxed(self, tool: Tool, args: MutableMapping[str, Any]) -> Any:
         try:
             if asyncio.iscoroutinefunction(tool.handler):
-                return asyncio.run(asyncio.wait_for(tool.handler(args), timeout=tool.timeout_seconds))
+                coro = asyncio.wait_for(tool.handler(args), timeout=tool.timeout_seconds)
+                future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+                return future.result(timeout=tool.timeout_seconds + 1)
             # sync handler: run in thread with timeout
-            import concurrent.futures
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(tool.handler, args)
-                return future.result(timeout=tool.timeout_seconds)
+            return self._get_executor().submit(tool.handler, args).result(timeout=tool.timeout_seconds)
         except Exception as exc:
             self._audit(tool.name, args, success=False)
             raise exc
 
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Worker pool for sync handlers, created on first use and reused for every call."""
+        if self._executor is None:
+            max_workers = int(self.config.get("tools.max_workers", 8) or 8)
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-")
+            atexit.register(self.close)
+        return self._executor
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop for coroutine handlers, running on a daemon thread.
+
+        One long-lived loop avoids an ``asyncio.run`` per call, and also works when
+        ``execute_tool`` is itself called from inside a running loop.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_loop, args=(loop,), name="tool-loop", daemon=True).start()
+                self._loop = loop
+                atexit.register(self.close)
+            return self._loop
+
+    def _close_audit(self) -> None:
+        if self._audit_fp is None:
+            return
+        self.flush_audit()
+        try:
+            self._audit_fp.close()
+        except OSError:
+            pass
+        self._audit_fp = None
+        atexit.unregister(self._close_audit)
+
     def _audit(self, name: str, args: MutableMapping[str, Any], success: bool) -> None:
-        if not self._audit_log:
+        """
+        Buffer one JSONL audit entry.
+
+        ``timestamp_ns`` is integer nanoseconds since the Unix epoch (``time.time_ns()``);
+        readers convert with ``datetime.fromtimestamp(ts / 1e9, tz=timezone.utc)``.
+        """
+        if self._audit_fp is None:
             return
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "tool": name,
             "success": success,
             "arg_keys": list(args.keys()),
         }
         try:
-            with self._audit_log.open("a", encoding="utf-8") as fp:
-                fp.write(f"{entry}\n")
+            self._audit_fp.write(fastjson.dumps(entry) + b"\n")
         except OSError:
-            pass
+            return
+        # Entries coalesce in the buffer; flush in batches rather than per call.
+        self._audit_pending += 1
+        if self._audit_pending >= AUDIT_FLUSH_EVERY:
+            self.flush_audit()
 
     def _register_builtin_tools(self) -> None:
         """Register built-in tools from the design spec."""
@@ -204,7 +348,7 @@ class ToolEngine:
             description="List files in a directory",
             parameters={
                 "type": "object",
-                "properties": {"path": {"type": "string"}},
+                "properties": {"path": {"type": "string"}, "limit": {"type": "integer", "description": "Maximum entries to return"}},
                 "required": ["path"],
             },
             handler=self._list_directory_handler,
@@ -226,28 +370,83 @@ class ToolEngine:
 
     # Built-in handlers --------------------------------------------------
     def _read_file_handler(self, args: dict) -> str:
-        path = Path(args["path"])
-        return path.read_text(encoding="utf-8")
+        with open(args["path"], "rb", buffering=0) as fp:
+            size = os.fstat(fp.fileno()).st_size
+            if size < MMAP_READ_THRESHOLD:
+                # Small files, and pseudo-files that report size 0, take one plain read.
+                data = fp.read()
+            else:
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return str(mm, "utf-8")
+        return data.decode("utf-8")
 
     def _write_file_handler(self, args: dict) -> str:
-        path = Path(args["path"])
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(args["content"], encoding="utf-8")
-        return f"Wrote {len(args['content'])} characters to {path}"
+        path = os.fspath(args["path"])
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        # Replace the file a symlink points at, not the link itself.
+        target = os.path.realpath(path)
+        parent, name = os.path.split(target)
+        data = args["content"].encode("utf-8")
+        try:
+            st: Optional[os.stat_result] = os.stat(target)
+        except FileNotFoundError:
+            st = None
+        if st is not None and st.st_nlink > 1:
+            # Swapping in a new inode would detach the other hard links; write in place instead.
+            fd = os.open(target, os.O_WRONLY | os.O_TRUNC)
+            try:
+                self._write_all(fd, data)
+            finally:
+                os.close(fd)
+            return f"Wrote {len(data)} bytes to {path}"
+        # Write a sibling temp file and swap it in, so readers never see a half-written file.
+        # The name is unique per thread: handlers share a pool, and two writes to one path
+        # must not truncate each other's temp file. os.open keeps umask-based modes for new files.
+        tmp = os.path.join(parent, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if st is not None:
+                os.fchmod(fd, stat.S_IMODE(st.st_mode))
+            self._write_all(fd, data)
+        except BaseException:
+            os.close(fd)
+            os.unlink(tmp)
+            raise
+        os.close(fd)
+        os.replace(tmp, target)
+        return f"Wrote {len(data)} bytes to {path}"
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
 
     def _list_directory_handler(self, args: dict) -> list[str]:
-        path = Path(args["path"])
-        return [str(p) for p in path.iterdir()]
+        limit = args.get("limit")
+        with os.scandir(args["path"]) as entries:
+            if limit is None:
+                return [entry.path for entry in entries]
+            return [entry.path for entry in islice(entries, int(limit))]
 
     def _shell_handler(self, args: dict) -> str:
-        result = subprocess.run(
+        # Capture raw bytes and decode once at the end instead of through text-mode pipes.
+        with subprocess.Popen(
             args["command"],
             shell=True,
-            capture_output=True,
-            text=True,
             cwd=args.get("cwd"),
-            timeout=600,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"Command failed: {result.stderr}")
-        return result.stdout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=600)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+        if proc.returncode != 0:
+            raise RuntimeError(f"Command failed: {stderr.decode('utf-8', 'replace')}")
+        return stdout.decode("utf-8", "replace")
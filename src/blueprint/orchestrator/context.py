@@ -3,95 +3,71 @@
 from __future__ import annotations
 
 import asyncio
-import pickle
-import sqlite3
+from bisect import bisect_right
 from collections import deque
 from datetime import datetime
+from itertools import accumulate, islice
 from pathlib import Path
 from typing import Deque, Dict, Iterable, List, MutableMapping, Sequence
 
 from ..config import ConfigLoader
 from ..models.base import ChatMessage, ChatRequest, Provider
 from ..state.persistence import Persistence
+from .memory import PersistentMemory
 
+_PROVIDER_BY_NAME = {provider.value: provider for provider in Provider}
 
-class PersistentMemory:
-    """SQLite-backed persistent memory store with lightweight embeddings."""
-
-    def __init__(self, db_path: Path) -> None:
-        self.db_path = db_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
-        self._ensure_schema()
-
-    def _ensure_schema(self) -> None:
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS memories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT,
-                value TEXT,
-                embedding BLOB,
-                tags TEXT,
-                added_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
-        self.conn.commit()
-
-    def add(self, key: str, value: str, tags: list[str] | None = None) -> None:
-        embedding = self._generate_embedding(value)
-        self.conn.execute(
-            """
-            INSERT INTO memories (key, value, embedding, tags)
-            VALUES (?, ?, ?, ?)
-            """,
-            (key, value, self._serialize_embedding(embedding), json_dumps(tags or [])),
-        )
-        self.conn.commit()
-
-    def retrieve(self, query: str, limit: int = 5) -> list[str]:
-        """Retrieve relevant memories using embedding similarity."""
-        query_embedding = self._generate_embedding(query)
-        cursor = self.conn.execute("SELECT value, embedding FROM memories")
 
-        results: list[tuple[float, str]] = []
-        for value, embedding_blob in cursor:
-            embedding = self._deserialize_embedding(embedding_blob)
-            similarity = self._cosine_similarity(query_embedding, embedding)
-            results.append((similarity, value))
+class _SessionBuffer:
+    """
+    One session key's bounded history.
 
-        results.sort(reverse=True, key=lambda x: x[0])
-        return [value for _, value in results[:limit]]
+    Content lengths live in their own column next to the messages, with a running
+    total, so token math reads plain ints instead of touching every ChatMessage.
+    """
 
-    def _generate_embedding(self, text: str) -> list[float]:
-        # Placeholder embedding; replace with model-backed embeddings if available.
-        return [float(len(text) % 10)] * 64
+    __slots__ = ("messages", "lengths", "chars")
 
-    def _serialize_embedding(self, embedding: list[float]) -> bytes:
-        return pickle.dumps(embedding)
+    def __init__(self, maxlen: int, messages: Iterable[ChatMessage] = ()) -> None:
+        self.messages: Deque[ChatMessage] = deque(messages, maxlen=maxlen)
+        self.lengths: Deque[int] = deque((len(m.content) for m in self.messages), maxlen=maxlen)
+        self.chars = sum(self.lengths)
 
-    def _deserialize_embedding(self, blob: bytes) -> list[float]:
-        return pickle.loads(blob)
+    def __len__(self) -> int:
+        return len(self.messages)
 
-    def _cosine_similarity(self, a: list[float], b: list[float]) -> float:
-        import math
+    def append(self, message: ChatMessage) -> None:
+        length = len(message.content)
+        if len(self.lengths) == self.lengths.maxlen:
+            # The appends below evict the oldest message.
+            self.chars -= self.lengths[0]
+        self.messages.append(message)
+        self.lengths.append(length)
+        self.chars += length
 
-        dot_product = sum(x * y for x, y in zip(a, b))
-        mag_a = math.sqrt(sum(x * x for x in a))
-        mag_b = math.sqrt(sum(x * x for x in b))
-        return dot_product / (mag_a * mag_b) if mag_a and mag_b else 0.0
 
+def _format_transcript(messages: Sequence[ChatMessage]) -> str:
+    """
+    Render messages as newline-separated ``role: content`` lines.
 
-def json_dumps(obj: object) -> str:
-    import json
-
-    return json.dumps(obj)
+    Roles and contents are slotted into one fragment list and joined once, so long
+    contents are copied a single time instead of first into a per-line f-string.
+    """
+    if not messages:
+        return ""
+    parts = ["\n", "", ": ", ""] * len(messages)
+    parts[0] = ""
+    parts[1::4] = [msg.role for msg in messages]
+    parts[3::4] = [msg.content for msg in messages]
+    return "".join(parts)
 
 
 class ContextManager:
     """Manages multi-tier context system (session + persistent + distillation)."""
 
+    # Messages kept verbatim after the older ones are folded into a summary.
+    SUMMARY_KEEP_RECENT = 10
+
     def __init__(self, config: ConfigLoader, orchestrator: "LLMOrchestrator" | None = None) -> None:
         self.config = config
         self.orchestrator = orchestrator
@@ -105,7 +81,15 @@ class ContextManager:
         self.distillation_backend = ctx("context.distillation_backend", "gemini")
         self.distillation_persona = ctx("context.distillation_persona", "context-distiller")
 
-        self._session: Dict[str, Deque[ChatMessage]] = {}
+        self._session: Dict[str, _SessionBuffer] = {}
+        # First session length at which a summary folds anything, or None when the
+        # bounded deque can never grow that long.
+        self._summarize_at: int | None = max(self.summarize_threshold, self.SUMMARY_KEEP_RECENT + 1)
+        if self._summarize_at > self.max_session_messages:
+            self._summarize_at = None
+        # Materialized get_context() lists (and their lengths) per key, dropped whenever
+        # their source deques change.
+        self._views: Dict[str, tuple[List[ChatMessage], List[int]]] = {}
 
         memory_enabled = bool(ctx("context.persistent_memory_enabled", True))
         memory_path = Path(ctx("context.memory_db_path", "~/.config/blueprint/memory.db")).expanduser()
@@ -115,10 +99,12 @@ class ContextManager:
     def add_message(self, message: ChatMessage, backend: str | None = None) -> None:
         """Add message to session context."""
         key = backend or "global"
-        if key not in self._session:
-            self._session[key] = deque(maxlen=self.max_session_messages)
-        self._session[key].append(message)
-        if len(self._session[key]) >= self.summarize_threshold:
+        history = self._session.get(key)
+        if history is None:
+            history = self._session[key] = _SessionBuffer(self.max_session_messages)
+        history.append(message)
+        self._invalidate_views(key)
+        if self._summarize_at is not None and len(history) >= self._summarize_at:
             self._summarize_context(key)
 
     def get_context(
@@ -129,13 +115,21 @@ class ContextManager:
     ) -> list[ChatMessage]:
         """Get context for backend, optionally distilling and trimming."""
         key = backend or "global"
-        context = list(self._session.get(key, []))
-        if key != "global":
-            context = list(self._session.get("global", [])) + context
+        cached = self._views.get(key)
+        if cached is None:
+            view: List[ChatMessage] = []
+            lengths: List[int] = []
+            keys = (key,) if key == "global" else ("global", key)
+            for part in filter(None, map(self._session.get, keys)):
+                view += part.messages
+                lengths += part.lengths
+            cached = self._views[key] = (view, lengths)
+        view, lengths = cached
 
         if max_tokens:
-            context = self._trim_to_tokens(context, max_tokens)
-        return context
+            return self._trim_to_tokens(view, max_tokens, lengths)
+        # Hand out a copy so callers cannot mutate the cached view.
+        return view.copy()
 
     def get_relevant_context(
         self,
@@ -144,73 +138,149 @@ class ContextManager:
         max_items: int = 5,
     ) -> list[ChatMessage]:
         """Combine persistent memory retrieval with recent session context."""
-        recent = self.get_context(backend)[-10:]
+        recent = self._recent(backend or "global", 10)
         memories = self.memory.retrieve(query, limit=max_items) if self.memory else []
         memory_messages = [ChatMessage(role="system", content=f"[Memory] {mem}") for mem in memories]
         return memory_messages + recent
 
+    def _recent(self, key: str, count: int) -> list[ChatMessage]:
+        """Last ``count`` messages of get_context(key), read from the deque tails only."""
+        recent = list(islice(reversed(self._messages(key)), count))
+        if key != "global" and len(recent) < count:
+            recent.extend(islice(reversed(self._messages("global")), count - len(recent)))
+        recent.reverse()
+        return recent
+
     def clear_backend_context(self, backend: str) -> None:
         """Clear session context for specific backend."""
         self._session.pop(backend, None)
+        self._invalidate_views(backend)
 
     def clear_all(self) -> None:
         """Clear all session contexts."""
         self._session.clear()
+        self._views.clear()
 
     # --- Persistent memory ----------------------------------------------
-    def remember(self, text: str, tags: Sequence[str] | None = None) -> None:
+    def remember(self, text: str, tags: Sequence[str] | None = None, *, durable: bool = False) -> None:
+        """Store a fact; pass ``durable=True`` to write it to disk before returning."""
         if not self.memory:
             return
         self.memory.add(key="note", value=text, tags=list(tags) if tags else [])
+        if durable:
+            self.memory.flush()
 
     def retrieve(self, query: str, limit: int = 5) -> List[str]:
         if not self.memory:
             return []
         return self.memory.retrieve(query, limit=limit)
 
+    async def retrieve_async(self, query: str, limit: int = 5) -> List[str]:
+        """retrieve() on a worker thread, so SQLite I/O never blocks the event loop."""
+        if not self.memory:
+            return []
+        return await asyncio.to_thread(self.memory.retrieve, query, limit)
+
     async def distill_async(self, backend: str, hint: str | None = None) -> List[ChatMessage]:
         """Async distillation that leverages the orchestrator's client when available."""
-        history = list(self._session.get(backend, ()))
+        history = list(self._messages(backend))
         if not history:
             return []
 
-        if self._estimate_tokens(history) <= self.distillation_trigger_tokens:
+        tokens = self._session_tokens(backend)
+        if tokens <= self.distillation_trigger_tokens:
             return history
 
-        summary_msg = await self._distill_context_async(history, hint, backend)
+        if tokens > self.distillation_trigger_tokens * 2:
+            # Too large for one prompt: distill slices in parallel, then merge their summaries.
+            chunks = self._split_by_tokens(history, self._session[backend].lengths, self.distillation_trigger_tokens)
+            partials = await asyncio.gather(*(self._distill_context_async(chunk, hint, backend) for chunk in chunks))
+            summary_msg = await self._distill_context_async(list(partials), hint, backend)
+        else:
+            summary_msg = await self._distill_context_async(history, hint, backend)
         keep_tail = history[-8:]
         distilled = [summary_msg] + keep_tail
-        self._session[backend] = deque(distilled, maxlen=self.max_session_messages)
+        self._replace_session(backend, distilled)
         return distilled
 
     # --- Internal helpers -----------------------------------------------
     def _summarize_context(self, key: str) -> None:
         """Summarize old context to save tokens."""
-        context = list(self._session[key])
-        keep_recent = 10
-        to_summarize = context[:-keep_recent]
-        recent = context[-keep_recent:]
-        if not to_summarize:
+        history = self._session[key].messages
+        split = len(history) - self.SUMMARY_KEEP_RECENT
+        if split <= 0:
             return
 
-        summary_text = "\n".join(f"{msg.role}: {msg.content}" for msg in to_summarize)
+        # Walk the deque in place instead of copying it twice into prefix/tail lists.
+        summary_text = _format_transcript(list(islice(history, split)))
         summary_msg = ChatMessage(
             role="system",
             content=f"[Previous conversation summary]: {summary_text}",
         )
-        self._session[key] = deque([summary_msg] + recent, maxlen=self.max_session_messages)
+        self._replace_session(key, [summary_msg, *islice(history, split, None)])
 
-    def _trim_to_tokens(self, messages: list[ChatMessage], max_tokens: int) -> list[ChatMessage]:
+    def _replace_session(self, key: str, messages: Iterable[ChatMessage]) -> None:
+        self._session[key] = _SessionBuffer(self.max_session_messages, messages)
+        self._invalidate_views(key)
+
+    def _messages(self, key: str) -> Sequence[ChatMessage]:
+        history = self._session.get(key)
+        return history.messages if history is not None else ()
+
+    def _invalidate_views(self, key: str) -> None:
+        if key == "global":
+            # Every backend view is prefixed with the global history.
+            self._views.clear()
+        else:
+            self._views.pop(key, None)
+
+    def _session_tokens(self, key: str) -> int:
+        """Estimated tokens held in one session key, from the running length counter."""
+        return max(1, self._chars(key) // 4)
+
+    def context_chars(self, backend: str | None = None) -> int:
+        """Total content length of what get_context(backend) returns, without building it."""
+        key = backend or "global"
+        chars = self._chars(key)
+        if key != "global":
+            chars += self._chars("global")
+        return chars
+
+    def _chars(self, key: str) -> int:
+        history = self._session.get(key)
+        return history.chars if history is not None else 0
+
+    def _trim_to_tokens(
+        self,
+        messages: list[ChatMessage],
+        max_tokens: int,
+        lengths: Sequence[int] | None = None,
+    ) -> list[ChatMessage]:
         """Trim message list to fit token budget, keeping most recent messages."""
-        total_tokens = 0
-        result: list[ChatMessage] = []
-        for msg in reversed(messages):
-            msg_tokens = len(msg.content) // 4
-            if total_tokens + msg_tokens > max_tokens:
-                break
-            result.insert(0, msg)
-            total_tokens += msg_tokens
-        return result
+        if lengths is None:
+            lengths = [len(msg.content) for msg in messages]
+        # Running token totals from the newest message backwards; they never decrease,
+        # so the number of messages that fit is one binary search away.
+        totals = list(accumulate(length // 4 for length in reversed(lengths)))
+        keep = bisect_right(totals, max_tokens)
+        return messages[len(messages) - keep :]
+
+    @staticmethod
+    def _split_by_tokens(
+        messages: Sequence[ChatMessage], lengths: Iterable[int], max_tokens: int
+    ) -> list[list[ChatMessage]]:
+        """Consecutive slices of ``messages`` of at most ``max_tokens`` each; oversized messages stand alone."""
+        chunks: list[list[ChatMessage]] = []
+        start = used = 0
+        for end, length in enumerate(lengths):
+            tokens = length // 4
+            if end > start and used + tokens > max_tokens:
+                chunks.append(list(messages[start:end]))
+                start, used = end, 0
+            used += tokens
+        if start < len(messages):
+            chunks.append(list(messages[start:]))
+        return chunks
 
     def _estimate_tokens(self, messages: Sequence[ChatMessage]) -> int:
         return max(1, sum(len(m.content) for m in messages) // 4)
@@ -255,17 +325,10 @@ class ContextManager:
         return ChatMessage(role="system", content=distilled_summary)
 
     def _provider_for_backend(self, backend: str) -> Provider:
-        mapping = {
-            "claude": Provider.CLAUDE,
-            "openai": Provider.OPENAI,
-            "gemini": Provider.GEMINI,
-            "ollama": Provider.OLLAMA,
-        }
-        return mapping.get(backend, Provider.GEMINI)
+        return _PROVIDER_BY_NAME.get(backend, Provider.GEMINI)
 
     def _format_context_for_distillation(self, context: list[ChatMessage]) -> str:
-        return "\n".join(f"{msg.role}: {msg.content}" for msg in context)
+        return _format_transcript(context)
 
     def stats(self, backend: str) -> dict[str, int]:
-        msgs = list(self._session.get(backend, ()))
-        return {"messages": len(msgs), "estimated_tokens": self._estimate_tokens(msgs)}
+        return {"messages": len(self._messages(backend)), "estimated_tokens": self._session_tokens(backend)}
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from ..models.router import ModelRole, ModelRouter
 from ..state.tasks import Task, TaskManager, TaskStatus, TaskType
+from ..utils import fastjson
 from ..utils.logger import Logger
 
 
@@ -21,6 +23,8 @@ class TaskExecutor:
         self.logger = Logger(feature_dir)
         self.current_task: Optional[Task] = None
         self.run_context: Optional[str] = None
+        # (st_mtime_ns, text) of the last spec.md read, reused while the file is unchanged.
+        self._spec_cache: Optional[Tuple[int, str]] = None
 
     async def execute_task(self, task: Task) -> bool:
         """
@@ -79,14 +83,16 @@ Description:
 
 Provide detailed architectural guidance, design decisions, and implementation approach."""
 
-        output_lines = []
-        async for line in claude.execute(prompt):
-            print(line)
-            output_lines.append(line)
-
         output_file = self.feature_dir / "partial" / f"{task.id}_architecture.md"
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text("\n".join(output_lines))
+        # Write lines as they stream in so disk I/O overlaps generation and nothing accumulates.
+        with output_file.open("w", encoding="utf-8", buffering=1 << 16) as out:
+            separator = ""
+            async for line in claude.execute(prompt):
+                print(line)
+                out.write(separator)
+                out.write(line)
+                separator = "\n"
         return True
 
     async def _execute_boilerplate_task(self, task: Task) -> bool:
@@ -94,21 +100,21 @@ Provide detailed architectural guidance, design decisions, and implementation ap
         gemini = await self.router.route(ModelRole.BOILERPLATE)
 
         output_text = await gemini.generate_boilerplate(task.description)
-        output_lines = output_text.splitlines()
-        for line in output_lines:
-            print(line)
+        output = "\n".join(output_text.splitlines())
+        # One write for the whole generation instead of a print() per line.
+        sys.stdout.write(output + "\n")
         output_file = self.feature_dir / "partial" / f"{task.id}_boilerplate.py"
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text("\n".join(output_lines))
+        output_file.write_text(output)
         print(f"\nBoilerplate saved to {output_file}")
         return True
 
     async def _execute_code_task(self, task: Task) -> bool:
         """Execute code generation task."""
-        spec_file = self.feature_dir / "spec.md"
         context_parts = []
-        if spec_file.exists():
-            context_parts.append(spec_file.read_text(encoding="utf-8"))
+        spec = self._read_spec()
+        if spec is not None:
+            context_parts.append(spec)
         if self.run_context:
             context_parts.append("\n\nSupplemental context:\n")
             context_parts.append(self.run_context)
@@ -117,16 +123,27 @@ Provide detailed architectural guidance, design decisions, and implementation ap
         coder = await self.router.route(ModelRole.CODER, content_size=len(context))
 
         output_text = await coder.generate_code(task.description, context)
-        output_lines = output_text.splitlines()
-        for line in output_lines:
-            print(line)
+        output = "\n".join(output_text.splitlines())
+        sys.stdout.write(output + "\n")
 
         output_file = self.feature_dir / "partial" / f"{task.id}_code.py"
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text("\n".join(output_lines))
+        output_file.write_text(output)
         print(f"\nCode saved to {output_file}")
         return True
 
+    def _read_spec(self) -> Optional[str]:
+        """Contents of spec.md, or None if absent; only re-read when its mtime changes."""
+        spec_file = self.feature_dir / "spec.md"
+        try:
+            mtime_ns = spec_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._spec_cache = None
+            return None
+        if self._spec_cache is None or self._spec_cache[0] != mtime_ns:
+            self._spec_cache = (mtime_ns, spec_file.read_text(encoding="utf-8"))
+        return self._spec_cache[1]
+
     async def _execute_review_task(self, task: Task) -> bool:
         """Execute code review task."""
         codex = await self.router.route(ModelRole.REVIEWER)
@@ -136,21 +153,27 @@ Provide detailed architectural guidance, design decisions, and implementation ap
             print("No code files found to review")
             return False
 
-        for code_file in code_files:
-            code = code_file.read_text(encoding="utf-8")
-            print(f"\nReviewing {code_file.name}...")
+        # Reviews are independent; issue them concurrently and report in file order.
+        codes = [code_file.read_text(encoding="utf-8") for code_file in code_files]
+        reviews = await asyncio.gather(*(codex.review_code(code, task.description) for code in codes))
 
-            review_result = await codex.review_code(code, task.description)
+        report = []
+        writes = []
+        for code_file, review_result in zip(code_files, reviews):
+            report.append(f"\nReviewing {code_file.name}...")
 
             if review_result.get("approved"):
-                print("✓ Code approved")
+                report.append("✓ Code approved")
             else:
-                print("✗ Code needs corrections:")
-                print(review_result.get("feedback"))
+                report.append("✗ Code needs corrections:")
+                report.append(str(review_result.get("feedback")))
 
                 review_file = self.feature_dir / "partial" / f"{code_file.stem}_review.json"
-                review_file.write_text(json.dumps(review_result, indent=2))
+                writes.append(asyncio.to_thread(review_file.write_bytes, fastjson.dumps(review_result, indent=True)))
 
+        sys.stdout.write("\n".join(report) + "\n")
+        # Review files are independent; write them off the event loop concurrently.
+        await asyncio.gather(*writes)
         return True
 
     async def stop_current_task(self) -> None:
@@ -0,0 +1,64 @@
+"""Provider fallback strategies for the orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from ..models.base import ChatResponse
+
+Attempt = Callable[[], Awaitable[ChatResponse]]
+
+
+async def first_success(attempts: Sequence[Attempt], hedge_delay: Optional[float] = None) -> ChatResponse:
+    """
+    Return the first successful attempt, trying them in order.
+
+    With ``hedge_delay`` set, slow attempts overlap with the next candidate instead of
+    being waited out (see ``hedge``).
+    """
+    if hedge_delay is not None:
+        return await hedge(attempts, hedge_delay)
+    last_error: Exception | None = None
+    for attempt in attempts:
+        try:
+            return await attempt()
+        except Exception as exc:  # noqa: PERF203
+            last_error = exc
+    raise last_error or RuntimeError("All providers failed to respond.")
+
+async def hedge(attempts: Sequence[Attempt], delay: float) -> ChatResponse:
+    """
+    Run ``attempts`` as a staggered hedge and return the first success.
+
+    The next attempt starts when the previous one fails or after ``delay`` seconds
+    without an answer, whichever comes first. Attempts finishing in the same tick are
+    resolved in launch order, so earlier (preferred) ones win ties. Losers are cancelled.
+    """
+    launched: List[asyncio.Task] = []
+    pending: set = set()
+    last_error: Exception | None = None
+
+    def launch() -> None:
+        task = asyncio.ensure_future(attempts[len(launched)]())
+        launched.append(task)
+        pending.add(task)
+
+    launch()
+    try:
+        while pending:
+            more = len(launched) < len(attempts)
+            done, pending = await asyncio.wait(
+                pending, timeout=delay if more else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in launched:
+                if task in done and task.exception() is None:
+                    return task.result()
+            for task in done:
+                last_error = task.exception()  # type: ignore[assignment]
+            if more:
+                launch()
+    finally:
+        for task in pending:
+            task.cancel()
+    raise last_error or RuntimeError("All providers failed to respond.")
@@ -0,0 +1,54 @@
+"""Event loop selection for Blueprint entrypoints."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from typing import Optional
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
+try:
+    import uringcore
+except ImportError:  # pragma: no cover - optional speedup
+    uringcore = None
+
+# Set to "0" to keep the stock asyncio loop even when a faster one is installed.
+LOOP_ENV_VAR = "BLUEPRINT_FAST_LOOP"
+
+_configured: Optional[str] = None
+
+
+def _supports_io_uring() -> bool:
+    """io_uring loops need Linux 5.11 or newer."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        major, minor = (int(part) for part in os.uname().release.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (5, 11)
+
+
+def configure_event_loop() -> Optional[str]:
+    """Install the fastest available event loop policy.
+
+    Prefers ``uringcore`` (io_uring, Linux 5.11+), then ``uvloop``; otherwise the
+    default asyncio policy is left alone. Only loops created afterwards are
+    affected, so call this before ``asyncio.run`` or starting the TUI. Returns
+    the name of the installed loop, or ``None``.
+    """
+    global _configured
+    if _configured is not None or os.environ.get(LOOP_ENV_VAR, "1") == "0":
+        return _configured
+    if uringcore is not None and _supports_io_uring():
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        _configured = "uringcore"
+    elif uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        _configured = "uvloop"
+    return _configured
@@ -0,0 +1,379 @@
+"""SQLite-backed persistent memory with hashed embeddings for the orchestrator."""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import json
+import math
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# Prefix of embedding blobs: raw unit-length float32 values follow. Blobs without it
+# predate the current format and are re-embedded on load.
+EMBEDDING_HEADER = b"F32\x03"
+# Feature-hashing buckets; a power of two so a bucket is a bit mask away.
+EMBEDDING_DIM = 64
+MEMORY_FLUSH_EVERY = 32
+# Lexical matches reranked by embedding when full-text search narrows a query.
+FTS_CANDIDATES = 500
+_WORD = re.compile(r"\w+")
+_INSERT_MEMORY = "INSERT INTO memories (key, value, embedding, tags) VALUES (?, ?, ?, ?)"
+
+try:  # NumPy scores all memories with one matrix-vector product
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=None)
+def _numba_cosine():
+    """
+    Numba-compiled single-pair cosine, or None without numba/NumPy.
+
+    Imported on first use: numba is slow to import and retrieval itself scores with
+    a matrix product, so only direct cosine callers should pay for it.
+    """
+    if np is None:
+        return None
+    try:
+        from numba import njit
+    except ImportError:  # pragma: no cover - optional speedup
+        return None
+
+    @njit(fastmath=True, cache=True)
+    def cosine(a, b):  # type: ignore[no-untyped-def]  # pragma: no cover - compiled
+        dot = norm_a = norm_b = 0.0
+        for i in range(a.shape[0]):
+            dot += a[i] * b[i]
+            norm_a += a[i] * a[i]
+            norm_b += b[i] * b[i]
+        denom = math.sqrt(norm_a * norm_b)
+        return dot / denom if denom else 0.0
+
+    return cosine
+
+
+class PersistentMemory:
+    """
+    SQLite-backed persistent memory store with lightweight embeddings.
+
+    Safe to share between threads: each thread queries through its own connection,
+    so WAL lets reads run side by side, while writes and updates to the in-memory
+    index are serialized by one lock.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # Rows from add() waiting for the next batched insert.
+        self._pending: list[tuple[str, str, bytes, str]] = []
+        # In-memory index of stored memories, in insertion order.
+        self._values: list[str] = []
+        self._vectors: list[array] = []
+        self._position: dict[int, int] = {}  # row id -> index in _values/_vectors
+        self._last_id = 0
+        # Stacked (N, D) copy of _vectors for NumPy scoring, extended as rows arrive.
+        self._matrix = None
+        self._ensure_schema()
+        atexit.register(self.close)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: batched writes open their own transaction in _write_batch.
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        # WAL with synchronous=NORMAL: commits append to the log instead of fsyncing the database.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        # A separate lock: the first query on a thread can run while _lock is held.
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _ensure_schema(self) -> None:
+        existing = {name for (name,) in self.conn.execute("SELECT name FROM sqlite_master")}
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT,
+                value TEXT,
+                embedding BLOB,  -- EMBEDDING_HEADER + little-endian float32 values
+                tags TEXT,
+                added_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # One row per (tag, memory) so tag filters use an index instead of parsing JSON.
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS memory_tags (
+                tag TEXT NOT NULL,
+                memory_id INTEGER NOT NULL,
+                PRIMARY KEY (tag, memory_id)
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS memories_tags_ai AFTER INSERT ON memories BEGIN
+                INSERT OR IGNORE INTO memory_tags (tag, memory_id) SELECT value, new.id FROM json_each(new.tags);
+            END;
+            """
+        )
+        if "memory_tags" not in existing:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO memory_tags (tag, memory_id) "
+                "SELECT j.value, m.id FROM memories AS m, json_each(m.tags) AS j"
+            )
+
+        # Full-text index over memory text for a lexical prefilter; FTS5 is a compile-time option.
+        try:
+            self.conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(value, content='memories', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS memories_fts_ai AFTER INSERT ON memories BEGIN
+                    INSERT INTO memories_fts (rowid, value) VALUES (new.id, new.value);
+                END;
+                """
+            )
+        except sqlite3.OperationalError:
+            self._fts = False
+            return
+        self._fts = True
+        if "memories_fts" not in existing:
+            self.conn.execute("INSERT INTO memories_fts (memories_fts) VALUES ('rebuild')")
+
+    def add(self, key: str, value: str, tags: list[str] | None = None) -> None:
+        """Queue a memory; rows are written in batches of MEMORY_FLUSH_EVERY."""
+        row = (key, value, self._serialize_embedding(self._embed(value)), json.dumps(tags or []))
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= MEMORY_FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write queued memories in a single transaction."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        self._write_batch(_INSERT_MEMORY, self._pending)
+        self._pending.clear()
+
+    def _write_batch(self, sql: str, rows: Sequence[tuple]) -> None:
+        """Run one statement over ``rows`` inside a single explicit transaction; caller holds the lock."""
+        cursor = self.conn
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(sql, rows)
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def close(self) -> None:
+        """Flush queued memories and close every thread's connection."""
+        with self._lock:
+            self._flush_locked()
+            with self._connections_lock:
+                for conn in self._connections:
+                    conn.close()
+                self._connections.clear()
+        self._local = threading.local()
+        atexit.unregister(self.close)
+
+    def retrieve(self, query: str, limit: int = 5, tags: Sequence[str] | None = None) -> list[str]:
+        """
+        Retrieve relevant memories using embedding similarity.
+
+        When full-text search is available, only the best lexical matches for the query
+        (up to FTS_CANDIDATES) are reranked by embedding; queries with no lexical match
+        fall back to scoring every memory. ``tags`` restricts results to memories
+        carrying any of the given tags.
+        """
+        with self._lock:
+            self._flush_locked()
+            self._load_new_rows()
+            # The index only grows, so the first ``count`` rows (and this matrix) stay
+            # valid after the lock is released; scoring runs unlocked.
+            count = len(self._values)
+            matrix = self._stacked_matrix() if np is not None and count else None
+        if not count or limit <= 0:
+            return []
+        candidates = self._candidates(query, tags, count)
+        if candidates is not None and not candidates:
+            return []
+        query_embedding = self._embed(query)
+        if matrix is not None:
+            order = self._rank_numpy(matrix, query_embedding, limit, candidates)
+        else:
+            order = self._rank_python(query_embedding, limit, candidates, count)
+        return [self._values[i] for i in order]
+
+    def _candidates(self, query: str, tags: Sequence[str] | None, count: int) -> list[int] | None:
+        """Index positions below ``count`` worth scoring, ascending, or None to score everything."""
+        ids: set[int] | None = None
+        if tags:
+            marks = ",".join("?" * len(tags))
+            ids = {
+                memory_id
+                for (memory_id,) in self.conn.execute(
+                    f"SELECT memory_id FROM memory_tags WHERE tag IN ({marks})", list(tags)
+                )
+            }
+        if self._fts:
+            terms = _WORD.findall(query)
+            if terms:
+                match = " OR ".join(f'"{term}"' for term in terms)
+                hits = {
+                    row_id
+                    for (row_id,) in self.conn.execute(
+                        "SELECT rowid FROM memories_fts WHERE memories_fts MATCH ? ORDER BY rank LIMIT ?",
+                        (match, FTS_CANDIDATES),
+                    )
+                }
+                narrowed = hits if ids is None else ids & hits
+                if narrowed:
+                    ids = narrowed
+        if ids is None:
+            return None
+        position = self._position
+        found = (position.get(row_id) for row_id in ids)
+        return sorted(i for i in found if i is not None and i < count)
+
+    def _stacked_matrix(self):
+        """(N, D) float32 copy of _vectors, extended with rows loaded since the last call."""
+        if self._matrix is None or len(self._matrix) < len(self._vectors):
+            start = 0 if self._matrix is None else len(self._matrix)
+            rows = np.asarray(self._vectors[start:], dtype=np.float32)
+            self._matrix = rows if self._matrix is None else np.vstack((self._matrix, rows))
+        return self._matrix
+
+    def _rank_numpy(self, matrix, query_embedding: array, limit: int, candidates: list[int] | None) -> Iterable[int]:
+        """Score memories with one matrix-vector product over unit-length rows."""
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        if candidates is None:
+            return _top_k(matrix @ query_vec, limit).tolist()
+        picked = np.asarray(candidates)
+        return picked[_top_k(matrix[picked] @ query_vec, limit)].tolist()
+
+    def _rank_python(
+        self, query_embedding: array, limit: int, candidates: list[int] | None, count: int
+    ) -> Iterable[int]:
+        vectors = self._vectors
+
+        def score(i: int) -> float:
+            return sum(x * y for x, y in zip(query_embedding, vectors[i]))
+
+        return heapq.nlargest(limit, range(count) if candidates is None else candidates, key=score)
+
+    def _load_new_rows(self) -> None:
+        """
+        Pull rows added since the last call into the in-memory index; caller holds the lock.
+
+        Embeddings are decoded once per row rather than on every query. Reading by
+        id also picks up rows written by other processes.
+        """
+        cursor = self.conn.execute("SELECT id, value, embedding FROM memories WHERE id > ? ORDER BY id", (self._last_id,))
+        stale: list[tuple[bytes, int]] = []
+        for row_id, value, embedding_blob in cursor:
+            embedding = self._deserialize_embedding(embedding_blob)
+            if embedding is None:
+                # Older rows (pickled or unnormalized); re-embed from the text rather than decode.
+                embedding = self._embed(value)
+                stale.append((self._serialize_embedding(embedding), row_id))
+            self._position[row_id] = len(self._values)
+            self._values.append(value)
+            self._vectors.append(embedding)
+            self._last_id = row_id
+        if stale:
+            self._write_batch("UPDATE memories SET embedding = ? WHERE id = ?", stale)
+
+    def _embed(self, text: str) -> array:
+        """Embedding of ``text`` scaled to unit length, so cosine similarity is a plain dot product."""
+        values = array("f", self._generate_embedding(text))
+        norm = math.sqrt(sum(x * x for x in values))
+        if norm:
+            values = array("f", [x / norm for x in values])
+        return values
+
+    def _generate_embedding(self, text: str) -> list[float]:
+        """
+        Hashed bag of words: every token adds +1 or -1 to one of EMBEDDING_DIM buckets.
+
+        crc32 rather than hash() keeps vectors stable across processes, since stored
+        embeddings are compared against queries embedded in later sessions.
+        """
+        vector = [0.0] * EMBEDDING_DIM
+        for token in _WORD.findall(text.lower()):
+            h = zlib.crc32(token.encode("utf-8"))
+            vector[h & (EMBEDDING_DIM - 1)] += 1.0 if h & EMBEDDING_DIM else -1.0
+        return vector
+
+    def _serialize_embedding(self, embedding: Sequence[float]) -> bytes:
+        """Header plus raw little-endian float32 values (256 bytes of payload at dim 64)."""
+        values = array("f", embedding)
+        if sys.byteorder == "big":  # pragma: no cover - stored little-endian everywhere
+            values.byteswap()
+        return EMBEDDING_HEADER + values.tobytes()
+
+    def _deserialize_embedding(self, blob: bytes) -> array | None:
+        """Decode a stored embedding, or None for blobs in an older format."""
+        if not blob or not blob.startswith(EMBEDDING_HEADER) or (len(blob) - len(EMBEDDING_HEADER)) % 4:
+            return None
+        values = array("f")
+        values.frombytes(blob[len(EMBEDDING_HEADER) :])
+        if sys.byteorder == "big":  # pragma: no cover
+            values.byteswap()
+        return values
+
+    def _cosine_similarity(self, a: Sequence[float], b: Sequence[float]) -> float:
+        if np is not None:
+            vec_a = np.asarray(a, dtype=np.float32)
+            vec_b = np.asarray(b, dtype=np.float32)
+            kernel = _numba_cosine()
+            if kernel is not None:
+                return float(kernel(vec_a, vec_b))
+            denom = math.sqrt(float(np.vdot(vec_a, vec_a)) * float(np.vdot(vec_b, vec_b)))
+            return float(np.vdot(vec_a, vec_b)) / denom if denom else 0.0
+        dot_product = sum(x * y for x, y in zip(a, b))
+        # One sqrt of the product instead of one per magnitude.
+        denom = math.sqrt(sum(x * x for x in a) * sum(y * y for y in b))
+        return dot_product / denom if denom else 0.0
+
+
+def _top_k(scores, limit: int):
+    """
+    Indices of the ``limit`` highest scores, best first.
+
+    Ties keep insertion order, matching a stable descending sort, while only the
+    candidates at or above the cut-off score are sorted.
+    """
+    n = len(scores)
+    if limit < n:
+        cutoff = np.partition(scores, n - limit)[n - limit]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(n)
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order[:limit]]
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
+from functools import partial
 from pathlib import Path
 from typing import AsyncGenerator, Iterable, List, MutableMapping, Optional, Sequence
 
@@ -14,15 +15,20 @@ from ..models.base import (
     ChatResponse,
     Provider,
     StreamChunk,
+    build_message_dicts,
 )
 from ..models.client import LLMClient
 from ..models.router import ModelRole, ModelRouter
 from ..models.tool_engine import ToolHandler
 from ..utils.usage_tracker import QuotaExceededError, UsageTracker
 from .context import ContextManager
+from .fallback import first_success
+from .loop import LOOP_ENV_VAR, configure_event_loop
 from .persona import Persona, PersonaManager
 from .streaming import StreamCoordinator
 from .task import Task, TaskCoordinator, TaskResult, TaskStep
+from .tool_calls import run_tool_calls
+from .tokens import estimate_tokens, warm_tokenizer
 
 
 BACKEND_ALIASES: MutableMapping[str, Provider] = {
@@ -35,14 +41,28 @@ BACKEND_ALIASES: MutableMapping[str, Provider] = {
     "ollama": Provider.OLLAMA,
     "deepseek": Provider.OLLAMA,
 }
-
+# Personas that pin a routing role, then task types that do; anything else is code work.
+_PERSONA_ROLE = {
+    "architect": ModelRole.ARCHITECT,
+    "code-specialist": ModelRole.CODER,
+    "fast-parser": ModelRole.PARSER,
+    "context-distiller": ModelRole.PARSER,
+}
+_TASK_ROLE = {"review": ModelRole.REVIEWER, "boilerplate": ModelRole.BOILERPLATE}
 
 class LLMOrchestrator:
     """Core orchestrator API used by the CLI, TUI, and automation layers."""
 
     def __init__(self, config: Optional[ConfigLoader] = None) -> None:
         self.config = config or ConfigLoader()
+        if os.environ.get(LOOP_ENV_VAR) == "1":
+            # Library callers opt in explicitly; the CLI installs the loop itself.
+            configure_event_loop()
+        # Budget checks use chars/4 until the BPE vocabulary has loaded off-thread.
+        warm_tokenizer()
         self.client = LLMClient(
+            cache_ttl_seconds=int(self.config.get("cache.ttl_seconds", 3600)),
+            cache_max_entries=int(self.config.get("cache.max_entries", 512)),
             fallback_chain=[
                 Provider.CLAUDE,
                 Provider.OPENAI,
@@ -54,7 +74,7 @@ class LLMOrchestrator:
         # Respect orchestrator fallback chain from config if present
         chain = self.config.get("orchestrator.fallback_chain")
         if isinstance(chain, list):
-            providers = [BACKEND_ALIASES.get(name, None) for name in chain]
+            providers = [BACKEND_ALIASES.get(str(name).casefold()) for name in chain]
             self.client.fallback_chain = [p for p in providers if p]
 
         self.router = ModelRouter(self.config)
@@ -89,8 +109,10 @@ class LLMOrchestrator:
         provider = await self._select_provider(backend, persona, message, task_type)
         persona_obj = self.personas.get(persona)
         messages = await self._prepare_messages(message, provider, persona_obj, include_context)
-        estimated_tokens = self._estimate_tokens(messages)
+        estimated_tokens = estimate_tokens(messages)
         self.usage_tracker.check_request_budget(estimated_tokens)
+        # Wire-format dicts for the history, built once for every attempt and any tool follow-up.
+        prebuilt = build_message_dicts(messages)
 
         response = await self._chat_with_fallback(
             messages=messages,
@@ -98,6 +120,7 @@ class LLMOrchestrator:
             tools=tools,
             max_tokens=max_tokens,
             temperature=temperature,
+            prebuilt=prebuilt,
         )
 
         if response.tool_calls:
@@ -108,6 +131,7 @@ class LLMOrchestrator:
                 tools=tools,
                 max_tokens=max_tokens,
                 temperature=temperature,
+                prebuilt=prebuilt,
             )
 
         self._record_context(provider, persona_obj, message, response)
@@ -129,10 +153,11 @@ class LLMOrchestrator:
         provider = await self._select_provider(backend, persona, message, task_type)
         persona_obj = self.personas.get(persona)
         messages = await self._prepare_messages(message, provider, persona_obj, include_context)
-        estimated_tokens = self._estimate_tokens(messages)
+        estimated_tokens = estimate_tokens(messages)
         self.usage_tracker.check_request_budget(estimated_tokens)
 
-        full_delta: List[str] = []
+        # Deltas are only kept when they will be recorded into context.
+        full_delta: Optional[List[str]] = [] if include_context else None
         request = ChatRequest(
             messages=messages,
             provider=provider,
@@ -144,11 +169,11 @@ class LLMOrchestrator:
 
         stream = self.client.stream(request)
         async for chunk in self.stream_coordinator.stream_with_validation(stream, tools):
-            if chunk.delta:
+            if chunk.delta and full_delta is not None:
                 full_delta.append(chunk.delta)
             yield chunk
 
-        if include_context and full_delta:
+        if full_delta:
             synthetic_response = ChatResponse(
                 content="".join(full_delta),
                 provider=provider,
@@ -177,8 +202,12 @@ class LLMOrchestrator:
         self.context_manager.remember(text, tags)
 
     def get_usage_stats(self) -> MutableMapping[str, float]:
-        """Expose aggregate usage for UI/CLI commands like /stats."""
-        return self.usage_tracker.get_stats()
+        """Expose aggregate usage (plus response-cache hits and misses) for UI/CLI commands like /stats."""
+        stats = self.usage_tracker.get_stats()
+        cache = self.client.cache.stats()
+        stats["cache_hits"] = cache["hits"]
+        stats["cache_misses"] = cache["misses"]
+        return stats
 
     def set_persona(self, name: str) -> Persona:
         """Switch the active persona."""
@@ -255,9 +284,11 @@ class LLMOrchestrator:
     ) -> Provider:
         """Choose a provider using explicit choice, persona hints, or router heuristics."""
         if backend:
-            if backend not in BACKEND_ALIASES:
+            # Alias keys are lower-case, so "Claude" and "OPENAI" resolve too.
+            provider = BACKEND_ALIASES.get(backend.casefold())
+            if provider is None:
                 raise KeyError(f"Unknown backend: {backend}")
-            return BACKEND_ALIASES[backend]
+            return provider
 
         role = self._role_for_task(task_type, persona)
         content_size = self._estimate_size(message)
@@ -266,19 +297,7 @@ class LLMOrchestrator:
 
     def _role_for_task(self, task_type: str, persona: str | None) -> ModelRole:
         """Map a task/persona into a routing role."""
-        if persona == "architect":
-            return ModelRole.ARCHITECT
-        if persona == "code-specialist":
-            return ModelRole.CODER
-        if persona == "fast-parser":
-            return ModelRole.PARSER
-        if persona == "context-distiller":
-            return ModelRole.PARSER
-        if task_type == "review":
-            return ModelRole.REVIEWER
-        if task_type == "boilerplate":
-            return ModelRole.BOILERPLATE
-        return ModelRole.CODER
+        return _PERSONA_ROLE.get(persona) or _TASK_ROLE.get(task_type, ModelRole.CODER)  # type: ignore[arg-type]
 
     async def _prepare_messages(
         self,
@@ -294,8 +313,9 @@ class LLMOrchestrator:
 
         backend_key = provider.value
         if include_context:
-            context_messages = self._memory_blend(incoming, backend_key)
-            if self._should_distill(context_messages):
+            memory_messages = await self._memory_messages(incoming)
+            context_messages = self.context_manager.get_context(backend_key) + memory_messages
+            if self._should_distill(backend_key, memory_messages):
                 context_messages = await self.context_manager_distill(
                     backend_key,
                     hint=incoming if isinstance(incoming, str) else None,
@@ -309,13 +329,11 @@ class LLMOrchestrator:
 
         return prepared
 
-    def _memory_blend(self, incoming: str | Sequence[ChatMessage], backend_key: str) -> List[ChatMessage]:
-        """Blend session context with lightweight memory hits."""
-        context = self.context_manager.get_context(backend_key)
+    async def _memory_messages(self, incoming: str | Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Persistent-memory hits for the incoming message, as system messages."""
         query = incoming if isinstance(incoming, str) else " ".join(msg.content for msg in incoming)
-        memories = self.context_manager.retrieve(query, limit=3)
-        memory_msgs = [ChatMessage(role="system", content=f"[Memory] {m}") for m in memories]
-        return context + memory_msgs
+        memories = await self.context_manager.retrieve_async(query, limit=3)
+        return [ChatMessage(role="system", content=f"[Memory] {m}") for m in memories]
 
     async def _chat_with_fallback(
         self,
@@ -325,28 +343,29 @@ class LLMOrchestrator:
         tools: Sequence[MutableMapping[str, object]] | None,
         max_tokens: int | None,
         temperature: float | None,
+        prebuilt: List[dict] | None = None,
     ) -> ChatResponse:
         """Try the preferred provider first, then fall back through the chain."""
         providers = [preferred_provider] + [
             p for p in self.client.fallback_chain if p != preferred_provider
         ]
-        last_error: Exception | None = None
-        for provider in providers:
-            request = ChatRequest(
+        if prebuilt is None:
+            prebuilt = build_message_dicts(messages)
+        requests = [
+            ChatRequest(
                 messages=messages,
                 provider=provider,
                 model=self._default_model(provider),
                 tools=tools,
                 max_tokens=max_tokens,
                 temperature=temperature,
+                prebuilt_messages=prebuilt,
             )
-            try:
-                return await self.client.chat(request)
-            except Exception as exc:  # noqa: PERF203
-                last_error = exc
-                continue
-
-        raise last_error or RuntimeError("All providers failed to respond.")
+            for provider in providers
+        ]
+        hedge_delay = self.config.get("orchestrator.fallback_hedge_delay")
+        attempts = [partial(self.client.chat, request) for request in requests]
+        return await first_success(attempts, None if hedge_delay is None else float(hedge_delay))
 
     async def _handle_tool_calls(
         self,
@@ -357,30 +376,28 @@ class LLMOrchestrator:
         tools: Sequence[MutableMapping[str, object]] | None,
         max_tokens: int | None,
         temperature: float | None,
+        prebuilt: List[dict] | None = None,
     ) -> ChatResponse:
         """Execute tool calls and send results back to the provider."""
-        follow_up: List[ChatMessage] = list(messages)
+        # Only the new turns are built here; the history and its wire dicts are reused as-is.
+        follow_up: List[ChatMessage] = []
         if initial.content:
             follow_up.append(ChatMessage(role="assistant", content=initial.content))
 
-        for call in initial.tool_calls or []:
-            tool_result = await self.client.execute_tool(call)
-            follow_up.append(
-                ChatMessage(
-                    role="tool",
-                    content=json.dumps(tool_result),
-                    name=call.name,
-                    tool_call_id=call.id,
-                )
-            )
+        follow_up += await run_tool_calls(
+            self.client.execute_tool, initial.tool_calls or [], parallel=bool(self.config.get("tools.parallel", True))
+        )
 
+        if prebuilt is None:
+            prebuilt = build_message_dicts(messages)
         request = ChatRequest(
-            messages=follow_up,
+            messages=[*messages, *follow_up],
             provider=provider,
             model=self._default_model(provider),
             tools=tools,
             max_tokens=max_tokens,
             temperature=temperature,
+            prebuilt_messages=prebuilt + build_message_dicts(follow_up),
         )
         return await self.client.chat(request)
 
@@ -423,11 +440,6 @@ class LLMOrchestrator:
             return len(message)
         return sum(len(m.content) for m in message)
 
-    def _estimate_tokens(self, messages: Sequence[ChatMessage]) -> int:
-        """Rough token estimate (character based heuristic)."""
-        chars = sum(len(m.content) for m in messages)
-        return max(1, chars // 4)
-
     def _audit_log_path(self) -> Path:
         """Location for tool audit logs (per-feature if available)."""
         base = getattr(self, "feature_dir", None)
@@ -435,10 +447,12 @@ class LLMOrchestrator:
             base = self.config.global_dir
         return Path(base) / "logs" / "tools.log"
 
-    def _should_distill(self, messages: Sequence[ChatMessage]) -> bool:
-        """Check if context distillation should run."""
+    def _should_distill(self, backend_key: str, memory_messages: Sequence[ChatMessage] = ()) -> bool:
+        """Check if context distillation should run for the session plus memory hits."""
         trigger = self.config.get("context.distillation_trigger_tokens", 50000)
-        return self._estimate_tokens(messages) > int(trigger)
+        # Session length comes from the context manager's running counter, not a re-scan.
+        chars = self.context_manager.context_chars(backend_key) + sum(len(m.content) for m in memory_messages)
+        return max(1, chars // 4) > int(trigger)
 
     async def context_manager_distill(self, backend: str, hint: str | None = None) -> List[ChatMessage]:
         """Delegate to context manager for distillation with LLM fallback."""
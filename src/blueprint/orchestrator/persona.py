@@ -27,25 +27,32 @@ class PersonaManager:
         self.config = config or ConfigLoader()
         self.personas: Dict[str, Persona] = {p.name: p for p in self._load_personas()}
         self._active: str = "general-assistant"
+        # Cached so the per-request get(None) path skips the name lookup.
+        self._active_persona: Optional[Persona] = self.personas.get(self._active)
 
     def set_active(self, name: str) -> Persona:
         """Select the active persona."""
-        if name not in self.personas:
-            raise KeyError(f"Unknown persona: {name}")
-        self._active = name
-        return self.personas[name]
+        try:
+            persona = self.personas[name]
+        except KeyError:
+            raise KeyError(f"Unknown persona: {name}") from None
+        self._active, self._active_persona = name, persona
+        return persona
 
     def get_active(self) -> Persona:
         """Return the current persona."""
-        return self.personas[self._active]
+        if self._active_persona is None:
+            return self.personas[self._active]
+        return self._active_persona
 
     def get(self, name: str | None) -> Persona:
         """Return a persona by name, falling back to the active one."""
         if name is None:
             return self.get_active()
-        if name not in self.personas:
-            raise KeyError(f"Unknown persona: {name}")
-        return self.personas[name]
+        try:
+            return self.personas[name]
+        except KeyError:
+            raise KeyError(f"Unknown persona: {name}") from None
 
     def list_names(self) -> Iterable[str]:
         """List available persona names."""
@@ -53,7 +60,7 @@ class PersonaManager:
 
     def _load_personas(self) -> Iterable[Persona]:
         """Load personas from config, falling back to defaults."""
-        raw = self.config.personas.get("personas") if hasattr(self.config, "personas") else None
+        raw = getattr(self.config, "personas", None)
         if not raw:
             raw = self.config._get_default_personas().get("personas", {})  # type: ignore[attr-defined]
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -138,8 +139,6 @@ class Pipeline:
         print("Paste your feature brief (press Ctrl+D when done):")
         print("-" * 60)
 
-        import sys
-
         brief = sys.stdin.read()
 
         feature = Feature(feature_name)
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import json
 from typing import AsyncGenerator, Iterator, List, Sequence
 
 from ..models.base import StreamChunk
+from ..models.streaming import _JsonShapeScanner
 
 
 class StreamCoordinator:
@@ -19,22 +21,41 @@ class StreamCoordinator:
         Stream with automatic validation and retry hooks.
 
         Features:
-        - Accumulates chunks for validation
-        - Detects incomplete/malformed output
+        - Checks JSON structure chunk by chunk when tools are in play
+        - Detects incomplete/malformed output, aborting malformed streams early
         - Yields terminal error chunk on failure
         """
+        # Tool responses must be JSON: their structure is checked as it streams and only
+        # text that is still well formed at the end gets a full parse. Plain responses
+        # just need some non-whitespace content, so nothing is accumulated for them.
+        scanner = _JsonShapeScanner() if tools else None
         accumulated: List[str] = []
+        has_text = False
         try:
             async for chunk in stream:
                 if chunk.error:
                     yield chunk
                     return
                 if chunk.delta:
-                    accumulated.append(chunk.delta)
+                    if scanner is not None:
+                        problem = scanner.feed(chunk.delta)
+                        if problem:
+                            # Stop paying for a generation that can no longer parse.
+                            yield StreamChunk(
+                                delta="",
+                                is_done=True,
+                                provider=chunk.provider,
+                                model=chunk.model,
+                                error=Exception(f"Invalid or incomplete response: {problem}"),
+                            )
+                            return
+                        accumulated.append(chunk.delta)
+                    elif not has_text:
+                        has_text = not chunk.delta.isspace()
                 yield chunk
                 if chunk.is_done:
-                    full_response = "".join(accumulated)
-                    if not self._validate_response(full_response, tools):
+                    valid = self._validate_response("".join(accumulated), tools) if tools else has_text
+                    if not valid:
                         yield StreamChunk(
                             delta="",
                             is_done=True,
@@ -52,13 +73,16 @@ class StreamCoordinator:
                 model=getattr(chunk, "model", None) if "chunk" in locals() else None,  # type: ignore[arg-type]
                 error=exc,
             )
+        finally:
+            # Closes the upstream (and its connection) when a stream is abandoned early.
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
 
     def _validate_response(self, response: str, tools: Sequence[object] | None) -> bool:
         """Validate complete response; basic JSON/tool call validation if tools provided."""
         if tools:
             try:
-                import json
-
                 parsed = json.loads(response)
                 return isinstance(parsed, dict) or isinstance(parsed, list)
             except Exception:
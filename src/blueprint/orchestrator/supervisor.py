@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from ..models.base import ChatMessage, ChatRequest
 from ..models.router import ModelRole, ModelRouter
 from ..state.tasks import Task
+from ..utils import fastjson
 
 
 class Supervisor:
@@ -31,7 +32,7 @@ class Supervisor:
 
         review_file = self.feature_dir / "partial" / f"{task.id}_review.json"
         review_file.parent.mkdir(parents=True, exist_ok=True)
-        review_file.write_text(json.dumps(result, indent=2))
+        review_file.write_bytes(fastjson.dumps(result, indent=True))
 
         return result
 
@@ -83,11 +84,9 @@ class Supervisor:
         if not self.codex:
             await self.initialize()
 
-        comparison_prompt = "Compare these outputs and select the best one:\n\n"
-        for idx, item in enumerate(outputs, 1):
-            comparison_prompt += f"Output {idx} (from {item['model']}):\n{item['output']}\n\n"
-
-        comparison_prompt += (
+        parts = ["Compare these outputs and select the best one:\n\n"]
+        parts.extend(f"Output {idx} (from {item['model']}):\n{item['output']}\n\n" for idx, item in enumerate(outputs, 1))
+        parts.append(
             "Respond in JSON:\n"
             "{\n"
             '  "selected": 1,\n'
@@ -95,8 +94,6 @@ class Supervisor:
             "}"
         )
 
-        result_json: List[str] = []
-        async for line in self.codex.execute(comparison_prompt, stream=False):
-            result_json.append(line)
-
-        return json.loads("\n".join(result_json))
+        # A non-streamed reply arrives whole; parse it directly rather than collecting lines.
+        response = await self.codex.chat(ChatRequest(messages=[ChatMessage(role="user", content="".join(parts))]))
+        return fastjson.loads(response.content)
@@ -0,0 +1,71 @@
+"""Token estimates for request budgets, using tiktoken once its vocabulary has loaded."""
+
+from __future__ import annotations
+
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Sequence
+
+from ..models.base import ChatMessage
+
+try:  # Real BPE counts for request budgets; falls back to the chars/4 heuristic
+    import tiktoken
+except ImportError:  # pragma: no cover - optional speedup
+    tiktoken = None
+
+ENCODING_NAME = "cl100k_base"
+# A failed load (usually offline) is retried after this long rather than never.
+LOAD_RETRY_SECONDS = 300.0
+
+_encoding = None
+_loading = False
+_failed_at: Optional[float] = None
+_state_lock = threading.Lock()
+
+
+def _load_encoding() -> None:
+    global _encoding, _loading, _failed_at
+    try:
+        encoding = tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        with _state_lock:
+            _failed_at = time.monotonic()
+            _loading = False
+        return
+    with _state_lock:
+        _encoding = encoding
+        _loading = False
+
+
+def warm_tokenizer() -> None:
+    """
+    Start loading the encoding in the background unless it is loaded, loading, or recently failed.
+
+    tiktoken downloads the vocabulary over blocking HTTP on first use, so the load
+    never runs on the caller's thread (usually the event loop). A daemon thread is
+    used rather than the loop's executor so an offline download cannot hold up
+    ``asyncio.run`` shutdown.
+    """
+    global _loading
+    if tiktoken is None or _encoding is not None:
+        return
+    with _state_lock:
+        if _loading or (_failed_at is not None and time.monotonic() - _failed_at < LOAD_RETRY_SECONDS):
+            return
+        _loading = True
+    threading.Thread(target=_load_encoding, name="tiktoken-load", daemon=True).start()
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens(text: str) -> int:
+    """Token count of one message body; cached so history is only encoded once per process."""
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def estimate_tokens(messages: Sequence[ChatMessage]) -> int:
+    """BPE counts once the encoding is ready; chars/4 until then, or without tiktoken."""
+    if _encoding is None:
+        warm_tokenizer()
+        return max(1, sum(len(m.content) for m in messages) // 4)
+    return max(1, sum(_count_tokens(m.content) for m in messages))
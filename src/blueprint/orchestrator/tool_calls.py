@@ -0,0 +1,32 @@
+"""Execution of model-requested tool calls for the orchestrator's follow-up turn."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Awaitable, Callable, List, MutableMapping, Sequence
+
+from ..models.base import ChatMessage, ToolCall
+
+ToolExecutor = Callable[[ToolCall], Awaitable[MutableMapping[str, object]]]
+
+
+async def run_tool_calls(execute: ToolExecutor, calls: Sequence[ToolCall], *, parallel: bool = True) -> List[ChatMessage]:
+    """
+    Run ``calls`` through ``execute`` and return one ``tool`` message per call, in call order.
+
+    Several calls run concurrently unless ``parallel`` is off (set ``tools.parallel = false``
+    when call order matters). A call that raises becomes an error result rather than
+    aborting the others.
+    """
+    if len(calls) > 1 and parallel:
+        results = await asyncio.gather(*(execute(call) for call in calls), return_exceptions=True)
+    else:
+        results = [await execute(call) for call in calls]
+
+    messages: List[ChatMessage] = []
+    for call, tool_result in zip(calls, results):
+        if isinstance(tool_result, Exception):
+            tool_result = {"toolCallId": call.id, "result": None, "error": repr(tool_result), "approved": False}
+        messages.append(ChatMessage(role="tool", content=json.dumps(tool_result), name=call.name, tool_call_id=call.id))
+    return messages
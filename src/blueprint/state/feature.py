@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..utils import fastjson
 from .persistence import Persistence
 
 
@@ -26,6 +28,8 @@ class Feature:
         self.logs_dir = self.base_dir / "logs"
         self.partial_dir = self.base_dir / "partial"
         self.summaries_dir = self.base_dir / "summaries"
+        # Tasks whose conversation file is known to be JSONL, so appends skip the format check.
+        self._jsonl_conversations: set[str] = set()
 
     def initialize(self) -> None:
         """Create feature directory structure and default files."""
@@ -103,23 +107,35 @@ class Feature:
         Persistence.ensure_dir(dir_path)
         conv_path = self.task_conversation_path(task_id)
 
-        # Maintain compatibility if existing file is newline-delimited JSON
-        entries = self.load_task_conversation_entries(task_id)
-        entries.append(
-            {
-                "timestamp": datetime.utcnow().isoformat(),
-                "role": role,
-                "content": message,
-            }
-        )
-        Persistence.save_json(conv_path, {"entries": entries})
+        if task_id not in self._jsonl_conversations:
+            # Older files hold one {"entries": [...]} document; convert those to JSONL once.
+            data = Persistence.load_json(conv_path)
+            if isinstance(data.get("entries"), list):
+                self._write_conversation_lines(conv_path, self.load_task_conversation_entries(task_id))
+            self._jsonl_conversations.add(task_id)
+
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "role": role,
+            "content": message,
+        }
+        with conv_path.open("ab") as fp:
+            fp.write(fastjson.dumps(entry) + b"\n")
 
     def clear_task_conversation(self, task_id: str) -> None:
         """Clear persisted conversation for a task."""
         dir_path = self.task_dir(task_id)
         Persistence.ensure_dir(dir_path)
         conv_path = self.task_conversation_path(task_id)
-        Persistence.save_json(conv_path, {"entries": []})
+        self._write_conversation_lines(conv_path, [])
+        self._jsonl_conversations.add(task_id)
+
+    @staticmethod
+    def _write_conversation_lines(conv_path: Path, entries: List[Dict[str, str]]) -> None:
+        """Atomically replace a conversation file with the given entries as JSONL."""
+        tmp = conv_path.with_suffix(".json.tmp")
+        tmp.write_bytes(b"".join(fastjson.dumps(entry) + b"\n" for entry in entries))
+        os.replace(tmp, conv_path)
 
     def load_task_conversation_entries(self, task_id: str) -> List[Dict[str, str]]:
         """Load conversation as structured entries."""
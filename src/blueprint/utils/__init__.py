@@ -1,6 +1,7 @@
 """Utility helpers."""
 
+from .executables import resolve_executable
 from .logger import Logger
 from .usage_tracker import UsageTracker
 
-__all__ = ["Logger", "UsageTracker"]
+__all__ = ["Logger", "UsageTracker", "resolve_executable"]
@@ -0,0 +1,37 @@
+"""Lookup helpers for external command-line tools."""
+
+from __future__ import annotations
+
+import shutil
+import time
+from typing import Dict, Optional
+
+_RESOLVED: Dict[str, str] = {}
+_MISSED_AT: Dict[str, float] = {}
+_MISS_TTL_SECONDS = 30.0
+
+
+def resolve_executable(name: str) -> Optional[str]:
+    """
+    Return the absolute path of ``name`` on PATH, or None if it is not installed.
+
+    Successful lookups are cached for the lifetime of the process so repeated spawns
+    skip the PATH walk. Misses are remembered for a short while only, so a tool
+    installed mid-session is still picked up.
+    """
+    path = _RESOLVED.get(name)
+    if path is not None:
+        return path
+
+    missed_at = _MISSED_AT.get(name)
+    now = time.monotonic()
+    if missed_at is not None and now - missed_at < _MISS_TTL_SECONDS:
+        return None
+
+    path = shutil.which(name)
+    if path:
+        _RESOLVED[name] = path
+        _MISSED_AT.pop(name, None)
+    else:
+        _MISSED_AT[name] = now
+    return path
@@ -0,0 +1,40 @@
+"""JSON encode/decode helpers that prefer orjson and fall back to the stdlib."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (tuple, set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode JSON from text or raw bytes without an intermediate str copy."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode UTF-8 JSON bytes: compact for request bodies, or two-space indented for files people read."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
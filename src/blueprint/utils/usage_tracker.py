@@ -20,6 +20,7 @@ class UsageRecord:
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
+    cached_tokens: int = 0
     cost: float = 0.0
     success: bool = True
     error: Optional[str] = None
@@ -74,6 +75,7 @@ class UsageTracker:
         prompt_tokens = self._read_field(usage, "prompt_tokens")
         completion_tokens = self._read_field(usage, "completion_tokens")
         total_tokens = self._read_field(usage, "total_tokens") or prompt_tokens + completion_tokens
+        cached_tokens = self._read_field(usage, "cached_tokens")
         estimated_cost = self._estimate_cost(provider, model, prompt_tokens, completion_tokens)
 
         if self.max_tokens_per_request and total_tokens > self.max_tokens_per_request:
@@ -87,6 +89,7 @@ class UsageTracker:
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
             total_tokens=total_tokens,
+            cached_tokens=cached_tokens,
             cost=estimated_cost,
             success=usage is not None,
         )
@@ -116,6 +119,7 @@ class UsageTracker:
             stats["prompt_tokens"] += r.prompt_tokens
             stats["completion_tokens"] += r.completion_tokens
             stats["total_tokens"] += r.total_tokens
+            stats["cached_tokens"] += r.cached_tokens
             stats["cost"] += r.cost
             if not r.success:
                 stats["errors"] += 1
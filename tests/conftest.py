@@ -0,0 +1,16 @@
+import pytest
+
+
+class DefaultsConfig:
+    """Config stand-in that answers every lookup with the caller's default."""
+
+    def get(self, key, default=None):
+        return default
+
+    def get_credential(self, provider, key):
+        return None
+
+
+@pytest.fixture
+def defaults_config():
+    return DefaultsConfig()
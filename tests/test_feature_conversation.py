@@ -22,9 +22,24 @@ def test_conversation_round_trip(tmp_path: Path) -> None:
     assert entries[1]["role"] == "assistant"
     assert entries[1]["content"] == "hi"
 
-    # Ensure JSON on disk is valid and includes entries
-    data = json.loads((feature.task_conversation_path("task-1")).read_text())
-    assert isinstance(data.get("entries"), list)
+    # Ensure the file on disk is JSONL with one entry per line
+    lines = feature.task_conversation_path("task-1").read_text().splitlines()
+    assert [json.loads(line)["content"] for line in lines] == ["hello", "hi"]
+
+
+def test_document_conversation_is_converted_before_append(tmp_path: Path) -> None:
+    feature = Feature("demo")
+    feature.base_dir = tmp_path / "feature"
+    feature.initialize()
+
+    path = feature.task_conversation_path("task-1")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"entries": [{"timestamp": "t0", "role": "user", "content": "old"}]}, indent=2))
+
+    feature.append_task_conversation("task-1", "assistant", "new")
+
+    entries = feature.load_task_conversation_entries("task-1")
+    assert [(e["role"], e["content"]) for e in entries] == [("user", "old"), ("assistant", "new")]
 
 
 def test_clear_task_conversation(tmp_path: Path) -> None:
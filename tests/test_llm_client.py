@@ -0,0 +1,312 @@
+import asyncio
+
+import httpx
+
+from blueprint.models.base import (
+    ChatMessage,
+    ChatRequest,
+    ChatResponse,
+    LLMUnavailableException,
+    ModelInfo,
+    Provider,
+    ProviderHealth,
+    StreamChunk,
+    Usage,
+    build_message_dicts,
+)
+from blueprint.models.claude import ClaudeAdapter
+from blueprint.models.client import LLMClient
+from blueprint.models.codex import OpenAIAdapter
+from blueprint.models.deepseek import OllamaAdapter
+from blueprint.models.gemini import GeminiAdapter
+from blueprint.models.router import ModelRouter
+from blueprint.models.streaming import StreamHandler
+
+
+class SlowModelsAdapter:
+    """Adapter stand-in whose list_models waits before answering."""
+
+    def __init__(self, provider: Provider, delay: float, fail: bool = False) -> None:
+        self.provider = provider
+        self.delay = delay
+        self.fail = fail
+
+    async def list_models(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise LLMUnavailableException("not configured")
+        return [ModelInfo(id=f"{self.provider.value}-model", provider=self.provider)]
+
+
+def test_list_models_queries_providers_concurrently(monkeypatch):
+    client = LLMClient(fallback_chain=[Provider.CLAUDE, Provider.OPENAI, Provider.GEMINI])
+    adapters = {
+        Provider.CLAUDE: SlowModelsAdapter(Provider.CLAUDE, 0.2),
+        Provider.OPENAI: SlowModelsAdapter(Provider.OPENAI, 0.2, fail=True),
+        Provider.GEMINI: SlowModelsAdapter(Provider.GEMINI, 0.2),
+    }
+    monkeypatch.setattr(client.adapter_factory, "create", lambda p: adapters[p])
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        models = await client.list_models()
+        return models, loop.time() - start
+
+    models, elapsed = asyncio.run(run())
+
+    assert models == [
+        {"id": "claude-model", "provider": "claude"},
+        {"id": "gemini-model", "provider": "gemini"},
+    ]
+    assert elapsed < 0.5
+
+
+def test_prebuilt_messages_reused_by_adapters():
+    messages = [
+        ChatMessage(role="user", content="hi"),
+        ChatMessage(role="tool", content="{}", name="read_file", tool_call_id="call-1"),
+    ]
+    request = ChatRequest(messages=messages, prebuilt_messages=build_message_dicts(messages))
+
+    ollama_payload = OllamaAdapter()._build_payload(request, stream=False)
+    assert ollama_payload["messages"] is request.prebuilt_messages
+
+    openai_payload = OpenAIAdapter()._build_payload(request, stream=False)
+    assert openai_payload["messages"][0] is request.prebuilt_messages[0]
+    assert openai_payload["messages"][1] == {
+        "role": "tool",
+        "content": "{}",
+        "name": "read_file",
+        "tool_call_id": "call-1",
+    }
+
+
+def test_prebuilt_messages_are_dropped_once_messages_change():
+    messages = [ChatMessage(role="system", content="be brief"), ChatMessage(role="user", content="hi")]
+    request = ChatRequest(messages=messages, prebuilt_messages=build_message_dicts(messages))
+    prebuilt = request.prebuilt_messages
+
+    assert request.message_dicts() is prebuilt
+    messages[1].content = "hello"
+    assert request.message_dicts()[1]["content"] == "hello"
+    request.messages = [ChatMessage(role="user", content="other"), ChatMessage(role="user", content="hi")]
+    assert [d["content"] for d in request.message_dicts()] == ["other", "hi"]
+    assert request.prebuilt_messages is prebuilt
+
+    gemini_payload = GeminiAdapter()._build_payload(request)
+    assert [c["parts"][0]["text"] for c in gemini_payload["contents"]] == ["other", "hi"]
+    assert not hasattr(request, "prebuilt_contents")
+
+
+def test_chat_defers_cache_and_usage_bookkeeping(monkeypatch):
+    client = LLMClient(fallback_chain=[Provider.OPENAI])
+
+    class EchoAdapter:
+        provider = Provider.OPENAI
+
+        async def chat(self, request):
+            return ChatResponse(
+                content="pong",
+                provider=Provider.OPENAI,
+                model="gpt-test",
+                usage=Usage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+            )
+
+    monkeypatch.setattr(client.adapter_factory, "create", lambda p: EchoAdapter())
+    request = ChatRequest(messages=[ChatMessage(role="user", content="ping")], temperature=0)
+
+    async def run():
+        response = await client.chat(request)
+        recorded_before_tick = client.usage_tracker.get_stats().get("requests", 0)
+        await asyncio.sleep(0)
+        cached = await client.chat(request)
+        return response, recorded_before_tick, cached
+
+    response, recorded_before_tick, cached = asyncio.run(run())
+
+    assert response.content == "pong"
+    assert recorded_before_tick == 0
+    assert cached is response
+    assert client.usage_tracker.get_stats()["total_tokens"] == 5
+
+
+def test_chat_cache_keys_on_sampling_and_skips_nondeterministic_requests(monkeypatch):
+    client = LLMClient(fallback_chain=[Provider.OPENAI])
+    calls = []
+
+    class CountingAdapter:
+        provider = Provider.OPENAI
+
+        async def chat(self, request):
+            calls.append(request)
+            return ChatResponse(content=f"r{len(calls)}", provider=Provider.OPENAI, model="gpt-test")
+
+    monkeypatch.setattr(client.adapter_factory, "create", lambda p: CountingAdapter())
+    messages = [ChatMessage(role="user", content="ping")]
+
+    async def ask(**kwargs):
+        response = await client.chat(ChatRequest(messages=messages, **kwargs))
+        await asyncio.sleep(0)
+        return response.content
+
+    async def run():
+        return [
+            await ask(temperature=0),
+            await ask(temperature=0),
+            await ask(temperature=0, max_tokens=10),
+            await ask(temperature=0.7),
+            await ask(temperature=0.7),
+            await ask(),
+            await ask(),
+        ]
+
+    assert asyncio.run(run()) == ["r1", "r1", "r2", "r3", "r4", "r5", "r6"]
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_chat_skips_usage_for_adapter_cache_hits(monkeypatch):
+    client = LLMClient(fallback_chain=[Provider.OPENAI])
+    usage = Usage(prompt_tokens=3, completion_tokens=2, total_tokens=5)
+
+    class ReplayingAdapter:
+        provider = Provider.OPENAI
+
+        async def chat(self, request):
+            return ChatResponse(content="pong", provider=Provider.OPENAI, model="gpt-test", usage=usage, metadata={"cached": True})
+
+    monkeypatch.setattr(client.adapter_factory, "create", lambda p: ReplayingAdapter())
+
+    async def run():
+        await client.chat(ChatRequest(messages=[ChatMessage(role="user", content="ping")], temperature=0.7))
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert client.usage_tracker.get_stats().get("total_tokens", 0) == 0
+
+
+def test_concurrent_identical_chats_share_one_provider_call(monkeypatch):
+    client = LLMClient(fallback_chain=[Provider.OPENAI])
+    calls = []
+
+    class SlowAdapter:
+        provider = Provider.OPENAI
+
+        async def chat(self, request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return ChatResponse(content="pong", provider=Provider.OPENAI, model="gpt-test")
+
+    monkeypatch.setattr(client.adapter_factory, "create", lambda p: SlowAdapter())
+    request = ChatRequest(messages=[ChatMessage(role="user", content="ping")], temperature=0)
+
+    async def run():
+        return await asyncio.gather(*(client.chat(request) for _ in range(5)))
+
+    responses = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(r is responses[0] for r in responses)
+    assert client._inflight == {}
+
+
+def test_claude_stream_skips_event_lines(monkeypatch):
+    body = (
+        b"event: message_start\n"
+        b'data: {"type":"message_start","message":{"model":"claude-test"}}\n\n'
+        b"event: content_block_delta\n"
+        b'data: {"type":"content_block_delta","delta":{"text":"Hi"}}\n\n'
+        b"event: message_delta\n"
+        b'data: {"type":"message_delta","delta":{"stop_reason":"end_turn"},"usage":{"output_tokens":1}}\n\n'
+    )
+    adapter = ClaudeAdapter()
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+
+    async def run():
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+        adapter._client_loop = asyncio.get_running_loop()
+        request = ChatRequest(messages=[ChatMessage(role="user", content="hi")], provider=Provider.CLAUDE)
+        chunks = [chunk async for chunk in adapter.stream_chat(request)]
+        await adapter.aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+
+    assert all(chunk.error is None for chunk in chunks)
+    assert "".join(chunk.delta for chunk in chunks) == "Hi"
+    assert chunks[-1].is_done
+
+
+def test_router_health_probe_is_single_flight_and_cached(defaults_config):
+    router = ModelRouter(defaults_config)
+    probes = []
+
+    async def check_health():
+        probes.append(1)
+        await asyncio.sleep(0.01)
+        return ProviderHealth(provider=Provider.OLLAMA, status="healthy")
+
+    router.ollama.check_health = check_health
+
+    async def run():
+        first = await asyncio.gather(*(router._is_ollama_available() for _ in range(5)))
+        again = await router._is_ollama_available()
+        return first, again
+
+    first, again = asyncio.run(run())
+
+    assert first == [True] * 5
+    assert again is True
+    assert len(probes) == 1
+
+
+class ScriptedStreamAdapter:
+    """Adapter stand-in that streams one text delta, or one error chunk when failing."""
+
+    def __init__(self, provider: Provider, fail: bool, raises: "Exception | None" = None) -> None:
+        self.provider = provider
+        self.fail = fail
+        self.raises = raises
+        self.calls = 0
+
+    async def stream_chat(self, request):
+        self.calls += 1
+        if self.raises is not None:
+            raise self.raises
+        if self.fail:
+            yield StreamChunk(delta="", is_done=True, provider=self.provider, error=LLMUnavailableException("down"))
+            return
+        yield StreamChunk(delta="ok", is_done=True, provider=self.provider)
+
+
+def test_stream_handler_falls_back_after_retries():
+    primary = ScriptedStreamAdapter(Provider.OPENAI, fail=True)
+    fallback = ScriptedStreamAdapter(Provider.CLAUDE, fail=False)
+    handler = StreamHandler(max_retries=1, backoff_seconds=0)
+    request = ChatRequest(messages=[ChatMessage(role="user", content="hi")])
+
+    async def run():
+        return [chunk async for chunk in handler.handle_stream(request, primary, [fallback])]
+
+    chunks = asyncio.run(run())
+
+    assert primary.calls == 2
+    assert fallback.calls == 1
+    assert [(c.delta, c.error) for c in chunks] == [("ok", None)]
+
+
+def test_stream_handler_falls_back_after_adapter_raises():
+    primary = ScriptedStreamAdapter(Provider.OPENAI, fail=True, raises=KeyError("choices"))
+    fallback = ScriptedStreamAdapter(Provider.CLAUDE, fail=False)
+    handler = StreamHandler(max_retries=0, backoff_seconds=0)
+    request = ChatRequest(messages=[ChatMessage(role="user", content="hi")])
+
+    async def run():
+        return [chunk async for chunk in handler.handle_stream(request, primary, [fallback])]
+
+    chunks = asyncio.run(run())
+
+    assert primary.calls == 1
+    assert fallback.calls == 1
+    assert [(c.delta, c.error) for c in chunks] == [("ok", None)]
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+from blueprint.orchestrator import loop
+
+
+def test_configure_event_loop_respects_opt_out(monkeypatch):
+    installed = []
+    monkeypatch.setattr(loop, "_configured", None)
+    monkeypatch.setattr(loop, "asyncio", SimpleNamespace(set_event_loop_policy=installed.append))
+    monkeypatch.setattr(loop, "uvloop", SimpleNamespace(EventLoopPolicy=lambda: "uv"))
+    monkeypatch.setattr(loop, "uringcore", None)
+
+    monkeypatch.setenv(loop.LOOP_ENV_VAR, "0")
+    assert loop.configure_event_loop() is None
+    monkeypatch.delenv(loop.LOOP_ENV_VAR)
+    assert loop.configure_event_loop() == "uvloop"
+    assert loop.configure_event_loop() == "uvloop"
+    assert installed == ["uv"]
@@ -0,0 +1,165 @@
+import asyncio
+
+import httpx
+
+from blueprint.models.base import ChatMessage, ChatRequest, Provider
+from blueprint.models.client import AdapterFactory
+from blueprint.models.codex import OpenAIAdapter
+
+
+SSE_BODY = (
+    b'data: {"model":"gpt-test","choices":[{"delta":{"content":"Hel"}}]}\r\n\r\n'
+    b": keep-alive comment\n\n"
+    b'data: {"choices":[{"delta":{"content":"lo","tool_calls":[{"index":0,"id":"call-1",'
+    b'"function":{"name":"read_file","arguments":"{\\"pa"}}]}}]}\n\n'
+    b'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"function":{"arguments":"th\\": \\"a.txt\\"}"}}]}}]}\n\n'
+    b'data: {"choices":[{"delta":{},"finish_reason":"tool_calls"}]}\n\n'
+    b"data: [DONE]\n\n"
+)
+
+
+def _collect(adapter: OpenAIAdapter, body: bytes):
+    async def run():
+        async def pieces():
+            # Split the body awkwardly to exercise framing across network chunks.
+            for i in range(0, len(body), 7):
+                yield body[i : i + 7]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=pieces())
+
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter._client_loop = asyncio.get_running_loop()
+        request = ChatRequest(messages=[ChatMessage(role="user", content="hi")], provider=Provider.OPENAI)
+        chunks = [chunk async for chunk in adapter.stream_chat(request)]
+        await adapter.aclose()
+        return chunks
+
+    return asyncio.run(run())
+
+
+def test_stream_chat_frames_sse_bytes_and_stitches_tool_arguments(monkeypatch):
+    adapter = OpenAIAdapter()
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+
+    chunks = _collect(adapter, SSE_BODY)
+
+    assert "".join(c.delta for c in chunks) == "Hello"
+    assert all(c.error is None for c in chunks)
+    progress = [c.tool_call for c in chunks if c.tool_call is not None and c.tool_call.is_partial]
+    assert [(call.id, call.name) for call in progress] == [("call-1", "read_file")] * 2
+    finished = [c for c in chunks if c.tool_call is not None and not c.tool_call.is_partial]
+    assert len(finished) == 1
+    assert finished[0].is_done
+    assert finished[0].tool_call.id == "call-1"
+    assert finished[0].tool_call.name == "read_file"
+    assert finished[0].tool_call.arguments == {"path": "a.txt"}
+    assert chunks[-1].is_done
+
+
+def test_chat_caches_low_temperature_requests(monkeypatch):
+    adapter = OpenAIAdapter()
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(
+            200,
+            json={"model": "gpt-test", "choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}]},
+        )
+
+    async def run():
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter._client_loop = asyncio.get_running_loop()
+        messages = [ChatMessage(role="user", content="review this")]
+        first = await adapter.chat(ChatRequest(messages=messages, temperature=0.0))
+        second = await adapter.chat(ChatRequest(messages=messages, temperature=0.0))
+        await adapter.chat(ChatRequest(messages=messages, temperature=0.7))
+        await adapter.chat(ChatRequest(messages=messages, temperature=0.7))
+        await adapter.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert second.content == first.content
+    assert second.metadata["cached"] is True
+    assert "cached" not in first.metadata
+    assert len(calls) == 3
+    assert adapter.response_cache.stats()["hits"] == 1
+
+
+def test_chat_cache_respects_cache_enabled(monkeypatch):
+    adapter = OpenAIAdapter(cache_enabled=False)
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    async def run():
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter._client_loop = asyncio.get_running_loop()
+        request = ChatRequest(messages=[ChatMessage(role="user", content="review this")], temperature=0.0)
+        await adapter.chat(request)
+        await adapter.chat(request)
+        await adapter.aclose()
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_chat_normalized_cache_keys_ignore_insignificant_whitespace(monkeypatch):
+    adapter = AdapterFactory(normalize_cache_keys=True).create(Provider.OPENAI)
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    async def run():
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter._client_loop = asyncio.get_running_loop()
+        for content in ("def f():\n    return 1\n", "def f():  \r\n    return 1\n\n\n\n"):
+            await adapter.chat(ChatRequest(messages=[ChatMessage(role="user", content=content)], temperature=0.0))
+        await adapter.aclose()
+
+    asyncio.run(run())
+
+    assert len(calls) == 1
+    # The request actually sent keeps the caller's text verbatim.
+    assert b"return 1" in calls[0].content
+
+
+def test_chat_retries_rate_limited_requests(monkeypatch):
+    adapter = OpenAIAdapter(max_retries=2)
+    monkeypatch.setattr(adapter.credentials, "get_api_key", lambda provider: "sk-test")
+    statuses = [429, 503, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        if status != 200:
+            return httpx.Response(status, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "done"}}]})
+
+    async def run():
+        adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        adapter._client_loop = asyncio.get_running_loop()
+        response = await adapter.chat(ChatRequest(messages=[ChatMessage(role="user", content="hi")]))
+        await adapter.aclose()
+        return response
+
+    assert asyncio.run(run()).content == "done"
+    assert statuses == []
+
+
+def test_parse_usage_reports_cached_prompt_tokens():
+    usage = OpenAIAdapter()._parse_usage(
+        {"prompt_tokens": 1200, "completion_tokens": 40, "prompt_tokens_details": {"cached_tokens": 1024}}
+    )
+
+    assert usage.cached_tokens == 1024
+    assert usage.total_tokens == 1240
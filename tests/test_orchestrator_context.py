@@ -1,8 +1,13 @@
 import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from blueprint.orchestrator.context import ContextManager
+from blueprint.orchestrator.memory import PersistentMemory
 from blueprint.orchestrator.orchestrator import LLMOrchestrator
-from blueprint.models.base import ChatMessage, ChatResponse, Provider, Usage
+from blueprint.models.base import ChatMessage, ChatResponse, Provider, ToolCall, Usage
 from blueprint.models.router import ModelRole
 
 
@@ -91,3 +96,229 @@ def test_chat_without_context(monkeypatch):
     contents = [m.content for m in captured["request"].messages]
     assert "old" not in contents
     assert "fresh" in contents
+
+
+class ContextConfig:
+    """Config stand-in for ContextManager with persistent memory disabled."""
+
+    def __init__(self, **overrides):
+        self.values = {"context.persistent_memory_enabled": False, **overrides}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def test_session_summarizes_prefix_and_keeps_recent_tail():
+    manager = ContextManager(ContextConfig(**{"context.auto_summarize_threshold": 15}))
+    for i in range(15):
+        manager.add_message(ChatMessage(role="user", content=f"m{i}"), "openai")
+
+    history = manager.get_context("openai")
+    assert len(history) == 11
+    assert history[0].role == "system"
+    assert history[0].content.startswith("[Previous conversation summary]: user: m0\nuser: m1")
+    assert "m4" in history[0].content and "m5" not in history[0].content
+    assert [m.content for m in history[1:]] == [f"m{i}" for i in range(5, 15)]
+
+
+def test_distill_maps_over_chunks_above_twice_the_trigger(monkeypatch):
+    manager = ContextManager(
+        ContextConfig(**{"context.distillation_trigger_tokens": 100, "context.auto_summarize_threshold": 100})
+    )
+    for i in range(6):
+        manager.add_message(ChatMessage(role="user", content=str(i) * 200), "openai")
+    calls = []
+
+    async def fake_distill(context, current_task, backend=None):
+        calls.append([m.content[0] for m in context])
+        return ChatMessage(role="system", content=f"s{len(calls)}")
+
+    monkeypatch.setattr(manager, "_distill_context_async", fake_distill)
+    distilled = asyncio.run(manager.distill_async("openai"))
+
+    assert calls[:3] == [["0", "1"], ["2", "3"], ["4", "5"]]
+    assert calls[3] == ["s", "s", "s"]
+    assert distilled[0].content == "s4"
+    assert len(distilled) == 7
+
+
+def test_session_token_counter_tracks_evictions_and_summaries():
+    manager = ContextManager(
+        ContextConfig(**{"context.session_max_messages": 3, "context.auto_summarize_threshold": 100})
+    )
+    for content in ("a" * 40, "b" * 80, "c" * 120, "d" * 160):
+        manager.add_message(ChatMessage(role="user", content=content), "openai")
+
+    # "a" * 40 was evicted by the bounded deque.
+    assert manager.stats("openai") == {"messages": 3, "estimated_tokens": (80 + 120 + 160) // 4}
+
+    manager.clear_backend_context("openai")
+    assert manager.stats("openai") == {"messages": 0, "estimated_tokens": 1}
+
+
+def test_persistent_memory_batches_inserts_until_flush(tmp_path):
+    db_path = tmp_path / "memory.db"
+    memory = PersistentMemory(db_path)
+    memory.add("note", "alpha")
+    memory.add("note", "beta", tags=["x"])
+
+    def stored_rows():
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        finally:
+            conn.close()
+
+    assert stored_rows() == 0
+    # Retrieval flushes pending rows first, so nothing queued is missed.
+    assert sorted(memory.retrieve("no lexical match", limit=5)) == ["alpha", "beta"]
+    assert stored_rows() == 2
+
+    memory.add("note", "gamma")
+    memory.close()
+    reopened = PersistentMemory(db_path)
+    try:
+        assert "gamma" in reopened.retrieve("gamma", limit=5)
+    finally:
+        reopened.close()
+
+
+def test_persistent_memory_prefilters_by_text_and_tags(tmp_path):
+    memory = PersistentMemory(tmp_path / "memory.db")
+    try:
+        memory.add("note", "the database runs in WAL mode", tags=["db"])
+        memory.add("note", "the frontend uses react", tags=["ui"])
+        memory.add("note", "sqlite database tuning notes", tags=["db", "perf"])
+
+        if memory._fts:
+            assert sorted(memory.retrieve("database", limit=5)) == [
+                "sqlite database tuning notes",
+                "the database runs in WAL mode",
+            ]
+        assert memory.retrieve("react", limit=5, tags=["perf"]) == ["sqlite database tuning notes"]
+        assert memory.retrieve("anything", limit=5, tags=["missing"]) == []
+    finally:
+        memory.close()
+
+
+def test_get_context_trims_oldest_messages_to_token_budget():
+    manager = ContextManager(ContextConfig())
+    for size in (40, 40, 40, 8):
+        manager.add_message(ChatMessage(role="user", content="x" * size), "openai")
+
+    # Budget 22 tokens: 2 + 10 + 10 fit, the oldest 10-token message does not.
+    assert [len(m.content) for m in manager.get_context("openai", max_tokens=22)] == [40, 40, 8]
+    assert manager.get_context("openai", max_tokens=1) == []
+
+
+def test_persistent_memory_embeddings_follow_shared_words(tmp_path):
+    memory = PersistentMemory(tmp_path / "memory.db")
+    try:
+        tuning = memory._embed("SQLite database tuning")
+        assert memory._cosine_similarity(tuning, memory._embed("database tuning sqlite")) == pytest.approx(1.0)
+        assert memory._cosine_similarity(tuning, memory._embed("the frontend uses react")) < 0.9
+    finally:
+        memory.close()
+
+
+def test_persistent_memory_is_shared_across_threads(tmp_path):
+    memory = PersistentMemory(tmp_path / "memory.db")
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: memory.add("note", f"fact {i}"), range(40)))
+            results = list(pool.map(lambda i: memory.retrieve(f"fact {i}", limit=40), range(8)))
+        assert all(len(found) == 40 for found in results)
+    finally:
+        memory.close()
+
+
+def test_chat_with_fallback_hedges_slow_preferred_provider(monkeypatch):
+    orchestrator = LLMOrchestrator()
+    settings = {"orchestrator.fallback_hedge_delay": 0.05}
+    monkeypatch.setattr(orchestrator.config, "get", lambda key, default=None: settings.get(key, default))
+    orchestrator.client.fallback_chain = [Provider.CLAUDE, Provider.OPENAI]
+    cancelled = []
+
+    async def fake_chat(request):
+        if request.provider is Provider.CLAUDE:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(request.provider)
+                raise
+        return ChatResponse(content=request.provider.value, provider=request.provider, model="m")
+
+    monkeypatch.setattr(orchestrator.client, "chat", fake_chat)
+
+    async def run():
+        response = await orchestrator._chat_with_fallback(
+            messages=[ChatMessage(role="user", content="hi")],
+            preferred_provider=Provider.CLAUDE,
+            tools=None,
+            max_tokens=None,
+            temperature=None,
+        )
+        await asyncio.sleep(0)
+        return response
+
+    assert asyncio.run(run()).content == "openai"
+    assert cancelled == [Provider.CLAUDE]
+
+
+def test_tool_follow_up_extends_the_prebuilt_history(monkeypatch):
+    orchestrator = LLMOrchestrator()
+    requests = []
+
+    async def fake_chat(request):
+        requests.append(request)
+        if len(requests) == 1:
+            calls = [ToolCall(id="c1", name="lookup", arguments={"q": "x"})]
+            return ChatResponse(content="checking", provider=request.provider, model="m", tool_calls=calls)
+        return ChatResponse(content="done", provider=request.provider, model="m")
+
+    async def fake_execute_tool(call):
+        return {"toolCallId": call.id, "result": "found"}
+
+    monkeypatch.setattr(orchestrator.client, "chat", fake_chat)
+    monkeypatch.setattr(orchestrator.client, "execute_tool", fake_execute_tool)
+
+    response = asyncio.run(orchestrator.chat("question", backend="openai", include_context=False))
+
+    first, follow_up = requests
+    assert response.content == "done"
+    assert [m.role for m in follow_up.messages[-2:]] == ["assistant", "tool"]
+    assert follow_up.message_dicts()[: len(first.messages)] == first.prebuilt_messages
+    assert follow_up.message_dicts()[0] is first.prebuilt_messages[0]
+    assert len(follow_up.prebuilt_messages) == len(follow_up.messages)
+
+
+def test_tool_calls_run_concurrently_and_keep_call_order(monkeypatch):
+    orchestrator = LLMOrchestrator()
+    requests = []
+    active = {"now": 0, "peak": 0}
+
+    async def fake_chat(request):
+        requests.append(request)
+        if len(requests) == 1:
+            calls = [ToolCall(id=f"c{i}", name="lookup", arguments={"q": i}) for i in range(3)]
+            return ChatResponse(content="", provider=request.provider, model="m", tool_calls=calls)
+        return ChatResponse(content="done", provider=request.provider, model="m")
+
+    async def fake_execute_tool(call):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01 if call.id == "c0" else 0)
+        active["now"] -= 1
+        if call.id == "c2":
+            raise RuntimeError("boom")
+        return {"toolCallId": call.id, "result": call.id}
+
+    monkeypatch.setattr(orchestrator.client, "chat", fake_chat)
+    monkeypatch.setattr(orchestrator.client, "execute_tool", fake_execute_tool)
+
+    asyncio.run(orchestrator.chat("question", backend="openai", include_context=False))
+
+    tool_messages = [m for m in requests[1].messages if m.role == "tool"]
+    assert active["peak"] == 3
+    assert [m.tool_call_id for m in tool_messages] == ["c0", "c1", "c2"]
+    assert "boom" in tool_messages[2].content
@@ -0,0 +1,33 @@
+import pytest
+
+from blueprint.config import ConfigLoader, _read_personas_file
+from blueprint.orchestrator.persona import PersonaManager
+
+
+def test_persona_manager_caches_active_persona():
+    manager = PersonaManager(ConfigLoader())
+    name = next(n for n in manager.list_names() if n != "general-assistant")
+
+    assert manager.get(None) is manager.personas["general-assistant"]
+    assert manager.set_active(name) is manager.get(None) is manager.get_active()
+    with pytest.raises(KeyError, match="Unknown persona"):
+        manager.set_active("missing")
+    assert manager.get(None).name == name
+
+
+def test_persona_manager_reads_personas_file(monkeypatch, tmp_path):
+    global_dir = tmp_path / "blueprint"
+    global_dir.mkdir()
+    (global_dir / "personas.toml").write_text(
+        '[personas.reviewer]\ndescription = "Strict"\nsystem_prompt = "Review."\ntemperature = 0.1\n'
+    )
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _read_personas_file.cache_clear()
+
+    first = PersonaManager(ConfigLoader())
+    second = PersonaManager(ConfigLoader())
+
+    assert first.get("reviewer").temperature == 0.1
+    assert list(second.list_names()) == ["reviewer"]
+    assert _read_personas_file.cache_info().hits == 1
@@ -0,0 +1,27 @@
+import asyncio
+
+from blueprint.models.base import Provider, StreamChunk
+from blueprint.orchestrator.streaming import StreamCoordinator
+
+
+def test_stream_validation_aborts_malformed_tool_json_early():
+    pulled = []
+
+    async def upstream():
+        for delta in ("Sure! ", '{"a": 1}', ""):
+            pulled.append(delta)
+            yield StreamChunk(delta=delta, is_done=delta == "", provider=Provider.OPENAI)
+
+    async def run(tools):
+        coordinator = StreamCoordinator()
+        return [chunk async for chunk in coordinator.stream_with_validation(upstream(), tools)]
+
+    chunks = asyncio.run(run([{"name": "read_file"}]))
+    assert pulled == ["Sure! "]
+    assert [c.delta for c in chunks] == [""]
+    assert "before the JSON value" in str(chunks[0].error)
+
+    pulled.clear()
+    chunks = asyncio.run(run(None))
+    assert [c.delta for c in chunks] == ["Sure! ", '{"a": 1}', ""]
+    assert all(c.error is None for c in chunks)
@@ -0,0 +1,63 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from blueprint.models.base import ChatMessage
+from blueprint.orchestrator import tokens
+
+
+def _reset(monkeypatch, get_encoding):
+    monkeypatch.setattr(tokens, "tiktoken", SimpleNamespace(get_encoding=get_encoding))
+    monkeypatch.setattr(tokens, "_encoding", None)
+    monkeypatch.setattr(tokens, "_loading", False)
+    monkeypatch.setattr(tokens, "_failed_at", None)
+    tokens._count_tokens.cache_clear()
+
+
+def test_estimate_tokens_never_waits_for_the_vocabulary(monkeypatch):
+    release = threading.Event()
+    loaded = threading.Event()
+
+    def slow_get_encoding(name):
+        release.wait(5)
+        loaded.set()
+        return SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+
+    _reset(monkeypatch, slow_get_encoding)
+    messages = [ChatMessage(role="user", content="one two three four five six seven eight")]
+
+    # The load is still blocked, so the heuristic answers immediately.
+    assert tokens.estimate_tokens(messages) == len(messages[0].content) // 4
+    release.set()
+    assert loaded.wait(5)
+    for _ in range(100):
+        if tokens._encoding is not None:
+            break
+        time.sleep(0.01)
+    assert tokens.estimate_tokens(messages) == 8
+
+
+def test_failed_load_is_retried_after_a_pause(monkeypatch):
+    attempts = []
+
+    def offline(name):
+        attempts.append(name)
+        raise OSError("offline")
+
+    _reset(monkeypatch, offline)
+    monkeypatch.setattr(tokens, "threading", SimpleNamespace(Thread=_InlineThread))
+
+    tokens.warm_tokenizer()
+    tokens.warm_tokenizer()
+    assert len(attempts) == 1
+    monkeypatch.setattr(tokens, "_failed_at", tokens._failed_at - tokens.LOAD_RETRY_SECONDS)
+    tokens.warm_tokenizer()
+    assert len(attempts) == 2
+
+
+class _InlineThread:
+    def __init__(self, target, name=None, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from blueprint.models.tool_engine import AUDIT_FLUSH_EVERY, PermissionManager, ToolEngine
+
+
+def test_audit_entries_are_buffered_until_flush(defaults_config, tmp_path):
+    engine = ToolEngine(config=defaults_config)
+    engine.set_mode("trust")
+    log_path = tmp_path / "audit" / "tools.log"
+    engine.enable_audit(log_path)
+    engine.register_tool("echo", lambda args: args["value"], requires_approval=False)
+
+    assert engine.execute_tool("echo", {"value": 1}) == 1
+    assert log_path.read_text() == ""
+
+    engine.flush_audit()
+    (line,) = log_path.read_text().splitlines()
+    entry = json.loads(line)
+    assert entry["tool"] == "echo"
+    assert entry["success"] is True
+    assert entry["arg_keys"] == ["value"]
+    assert isinstance(entry["timestamp_ns"], int)
+
+    for i in range(AUDIT_FLUSH_EVERY):
+        engine.execute_tool("echo", {"value": i})
+    assert len(log_path.read_text().splitlines()) == AUDIT_FLUSH_EVERY + 1
+
+
+def test_async_handler_runs_on_shared_loop_inside_running_loop(defaults_config):
+    engine = ToolEngine(config=defaults_config)
+    engine.set_mode("trust")
+    loops = []
+
+    async def handler(args):
+        loops.append(asyncio.get_running_loop())
+        return args["value"] * 2
+
+    engine.register_tool("double", handler, requires_approval=False)
+
+    async def main():
+        # execute_tool is called from async code such as LLMClient.execute_tool.
+        return [engine.execute_tool("double", {"value": i}) for i in range(3)]
+
+    try:
+        assert asyncio.run(main()) == [0, 2, 4]
+        assert len(set(map(id, loops))) == 1
+    finally:
+        engine.close()
+
+
+def test_auto_approve_patterns_match_per_tool_and_wildcard(defaults_config):
+    manager = PermissionManager(defaults_config)
+    manager.auto_approve_patterns = ["read_file:src/**", "read_file:docs/*.md", "**:tmp/*", "list_directory"]
+
+    assert manager.is_whitelisted("read_file", {"path": "src/pkg/mod.py"})
+    assert manager.is_whitelisted("read_file", {"path": "docs/index.md"})
+    assert not manager.is_whitelisted("read_file", {"path": "secrets.env"})
+    assert manager.is_whitelisted("write_file", {"path": "tmp/out.txt"})
+    assert manager.is_whitelisted("list_directory", {})
+    assert not manager.is_whitelisted("write_file", {})
+
+
+def test_concurrent_writes_to_one_path_publish_whole_contents(defaults_config, tmp_path):
+    engine = ToolEngine(config=defaults_config)
+    target = tmp_path / "out.txt"
+    contents = [str(i) * 200_000 for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda text: engine._write_file_handler({"path": str(target), "content": text}), contents))
+
+    assert target.read_text() in contents
+    assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+
+def test_write_file_goes_through_symlinks_and_hard_links(defaults_config, tmp_path):
+    engine = ToolEngine(config=defaults_config)
+    real = tmp_path / "real.txt"
+    real.write_text("old")
+    link = tmp_path / "link.txt"
+    link.symlink_to(real)
+    hard = tmp_path / "hard.txt"
+    os.link(real, hard)
+
+    engine._write_file_handler({"path": str(link), "content": "via symlink"})
+    assert link.is_symlink()
+    assert hard.read_text() == "via symlink"
+
+    engine._write_file_handler({"path": str(hard), "content": "via hard link"})
+    assert real.read_text() == "via hard link"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["hard.txt", "link.txt", "real.txt"]